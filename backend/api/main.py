@@ -3,7 +3,7 @@
 import logging
 import os
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -14,6 +14,7 @@ from backend.api.v1 import api_router
 from backend.config.logging import setup_logging
 from backend.config.settings import settings
 from backend.core.utils.async_logger import stop_all_async_loggers
+from backend.core.users.service import begin_request_profile_cache, end_request_profile_cache
 
 # Setup logging
 setup_logging()
@@ -69,6 +70,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+# Per-request user profile memo
+@app.middleware("http")
+async def request_profile_cache_middleware(request: Request, call_next):
+    """Memoize user profiles for the duration of a request."""
+    token = begin_request_profile_cache()
+    try:
+        return await call_next(request)
+    finally:
+        end_request_profile_cache(token)
+
+
 # Include API routes
 app.include_router(api_router)
 
@@ -82,10 +82,10 @@ async def signup(request: SignUpRequest):
                 detail="Failed to create session"
             )
 
-        # Create or update user profile
+        # Create or update user profile (service role: users has RLS)
         user_id = auth_response.user.id
         try:
-            supabase.table("users").insert({
+            get_supabase_client(use_service_role=True).table("users").insert({
                 "id": user_id,
                 "email": request.email,
                 "full_name": request.full_name,
@@ -138,9 +138,9 @@ async def signin(request: SignInRequest):
                 detail="Invalid email or password"
             )
 
-        # Get user profile
+        # Get user profile (service role: users has RLS)
         user_id = auth_response.user.id
-        user_profile = supabase.table("users").select(
+        user_profile = get_supabase_client(use_service_role=True).table("users").select(
             "*").eq("id", user_id).execute()
 
         user_data = {
@@ -377,9 +377,9 @@ async def oauth_callback(request: OAuthCallbackRequest):
                     detail="Failed to retrieve user information"
                 )
 
-        # Get user profile
+        # Get user profile (service role: users has RLS)
         user_id = user.id
-        user_profile = supabase.table("users").select(
+        user_profile = get_supabase_client(use_service_role=True).table("users").select(
             "*").eq("id", user_id).execute()
 
         user_data = {
@@ -2,11 +2,14 @@
 Document management API endpoints.
 """
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status, Query, Form, Request
-from typing import Optional, List
+from typing import Any, AsyncIterator, Optional, List
 from uuid import UUID
 import logging
 import json
 import asyncio
+import hashlib
+import os
+import uuid
 from datetime import datetime, timezone
 
 from backend.core.auth.dependencies import get_current_user
@@ -26,6 +29,34 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
+# Read size when forwarding uploads to storage
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _get_upload_size(file: UploadFile) -> int:
+    """Get upload size without reading the file into memory."""
+    if file.size is not None:
+        return file.size
+    file.file.seek(0, os.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(0)
+    return size
+
+
+async def _stream_upload(
+    file: UploadFile,
+    hasher: Optional[Any] = None
+) -> AsyncIterator[bytes]:
+    """Yield the uploaded file in chunks, feeding each chunk to hasher if given."""
+    await file.seek(0)
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        if hasher is not None:
+            hasher.update(chunk)
+        yield chunk
+
 
 async def _process_single_file(
     file: UploadFile,
@@ -38,9 +69,8 @@ async def _process_single_file(
     # Validate file
     file_extension = f".{file.filename.split('.')[-1].lower()}" if '.' in file.filename else ""
 
-    # Read file content
-    content = await file.read()
-    file_size = len(content)
+    # Size comes from the spooled upload, content is streamed later
+    file_size = _get_upload_size(file)
 
     # Validate file
     is_valid, error_message = validator.validate_file(
@@ -70,28 +100,19 @@ async def _process_single_file(
     if metadata:
         metadata_dict = metadata.model_dump(exclude_none=True)
 
-    # Create document record with metadata
-    document = service.create_document(
-        user_id=user_id,
-        filename=file.filename or "document",
-        original_filename=file.filename or "document",
-        file_extension=file_extension,
-        file_size=file_size,
-        mime_type=mime_type,
-        metadata=metadata_dict
-    )
-
-    # Upload to storage
-    storage_path = f"{user_id}/{document.id}/{file.filename}"
+    # Upload to storage, hashing the content as it streams through
+    document_id = str(uuid.uuid4())
+    storage_path = f"{user_id}/{document_id}/{file.filename}"
+    hasher = hashlib.sha256()
     try:
-        service.storage.upload_file(
-            file_content=content,
+        await service.storage.upload_file(
+            file_stream=_stream_upload(file, hasher),
             file_path=storage_path,
             content_type=mime_type,
-            user_id=user_id
+            size=file_size
         )
         logger.info(
-            f"Document uploaded to storage: {document.id} by user {user_id}")
+            f"Document uploaded to storage: {document_id} by user {user_id}")
     except Exception as e:
         error_msg = str(e)
         logger.error(
@@ -107,16 +128,57 @@ async def _process_single_file(
             detail=f"Failed to upload file to storage: {error_msg}"
         )
 
+    # Create document record with metadata (returns the existing document for duplicates)
+    document = service.create_document(
+        user_id=user_id,
+        filename=file.filename or "document",
+        original_filename=file.filename or "document",
+        file_extension=file_extension,
+        file_size=file_size,
+        mime_type=mime_type,
+        metadata=metadata_dict,
+        document_id=document_id,
+        content_hash=hasher.hexdigest()
+    )
+
+    if str(document.id) != document_id:
+        # Duplicate upload: drop the new object (the existing document keeps its own)
+        try:
+            service.storage.delete_file(storage_path)
+        except Exception as e:
+            logger.warning(f"Error deleting duplicate upload {storage_path}: {e}")
+
+        if document.status != DocumentStatus.FAILED:
+            # Skip re-processing
+            logger.info(
+                f"Duplicate upload by user {user_id}, reusing document {document.id}")
+            return DocumentUploadResponse(
+                document_id=document.id,
+                status=document.status.value,
+                message="Document already uploaded. Reusing existing document.",
+                metadata=document.metadata
+            )
+
+        # Previous attempt failed: reset it and send this upload for processing
+        logger.info(
+            f"Duplicate upload by user {user_id} of failed document {document.id}, retrying")
+        document = service.update_document(
+            str(document.id),
+            user_id,
+            DocumentUpdate(status=DocumentStatus.UPLOADED, error_message=None)
+        ) or document
+
     # Send to Vast.ai for processing
     vast_ai_client = None
     try:
         logger.info(f"About to send document {document.id} to Vast.ai server")
         # Send file to Vast.ai server
         vast_ai_client = VastAIClient()
-        file_content_bytes = content  # File is already in memory
+        # Send the spooled file object so httpx streams it from disk
+        await file.seek(0)
         logger.info(f"VastAI client created, sending document {document.id}")
         result = await vast_ai_client.process_documents(
-            files=[file_content_bytes],
+            files=[file.file],
             filenames=[file.filename or "document"],
             user_id=user_id,
             document_ids=[str(document.id)],
@@ -395,7 +457,8 @@ async def delete_document(
     """Delete document and associated files."""
     try:
         service = DocumentService()
-        success = service.delete_document(str(document_id), current_user["id"])
+        success = await service.delete_document_async(
+            str(document_id), current_user["id"])
 
         if not success:
             raise HTTPException(
@@ -427,7 +490,7 @@ async def vast_ai_webhook(request: Request):
 
     Expected payload:
     {
-        "task_id": "uuid",
+        "task_id": "string",
         "status": "completed" | "failed",
         "result": {
             "success": true,
@@ -513,12 +576,13 @@ async def vast_ai_webhook(request: Request):
 
         # Update document based on status
         if status_str == "completed" and result:
+            completed_at = datetime.now(timezone.utc)
             update_data = DocumentUpdate(
                 status=DocumentStatus.INDEXED,
                 page_count=result.get("page_count"),
                 content_list_path=result.get("content_list_path"),
-                processing_completed_at=datetime.now(timezone.utc),
-                indexed_at=datetime.now(timezone.utc)
+                processing_completed_at=completed_at,
+                indexed_at=completed_at
             )
             updated_doc = service.update_document(
                 document_id, user_id, update_data)
@@ -104,12 +104,13 @@ async def get_my_usage(
     try:
         user_id = current_user["id"]
 
+        # Get user profile for subscription info (also used for limits)
+        profile = user_service.get_user_profile(user_id)
+
         # Get detailed usage stats from tracker
         from backend.core.usage.tracker import usage_tracker
-        stats = usage_tracker.get_user_usage_stats(user_id, days=days)
-
-        # Get user profile for subscription info
-        profile = user_service.get_user_profile(user_id)
+        stats = usage_tracker.get_user_usage_stats(
+            user_id, days=days, user_profile=profile)
 
         return {
             "queries_used_this_month": stats["queries_used_this_month"],
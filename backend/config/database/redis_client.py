@@ -0,0 +1,66 @@
+"""
+Redis client setup and initialization
+"""
+
+from typing import Optional, Any
+from backend.config.settings import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Global Redis client instance (None when Redis is not configured or unreachable)
+_redis_client: Optional[Any] = None
+_redis_initialized = False
+
+# Fail fast when Redis is unreachable instead of waiting on OS TCP timeouts
+# (callers then fall back to in-process behaviour)
+REDIS_CONNECT_TIMEOUT_SECONDS = 2.0
+REDIS_SOCKET_TIMEOUT_SECONDS = 2.0
+
+
+def get_redis_client() -> Optional[Any]:
+    """
+    Get or create Redis client instance
+
+    Redis is optional: callers fall back to in-process behaviour when this
+    returns None.
+
+    Returns:
+        redis.Redis instance, or None if REDIS_URL is not set, the redis
+        package is not installed, or the server is unreachable
+    """
+    global _redis_client, _redis_initialized
+
+    if _redis_initialized:
+        return _redis_client
+
+    _redis_initialized = True
+
+    if not settings.REDIS_URL:
+        logger.info("REDIS_URL not configured - using in-process caches only")
+        return None
+
+    try:
+        import redis
+        client = redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=REDIS_CONNECT_TIMEOUT_SECONDS,
+            socket_timeout=REDIS_SOCKET_TIMEOUT_SECONDS
+        )
+        client.ping()
+        _redis_client = client
+        logger.info("Redis client initialized successfully")
+    except ImportError:
+        logger.warning("Redis not installed - using in-process caches only")
+    except Exception as e:
+        logger.warning(
+            f"Redis connection failed: {e} - using in-process caches only")
+
+    return _redis_client
+
+
+def reset_redis_client() -> None:
+    """Reset Redis client (useful for testing)"""
+    global _redis_client, _redis_initialized
+    _redis_client = None
+    _redis_initialized = False
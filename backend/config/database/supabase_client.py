@@ -2,21 +2,21 @@
 Supabase client setup and initialization
 """
 
-from typing import Optional
+from functools import lru_cache
 from supabase import create_client, Client
 from backend.config.settings import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Global Supabase client instance
-_supabase_client: Optional[Client] = None
-
 
 def get_supabase_client(use_service_role: bool = False) -> Client:
     """
     Get or create Supabase client instance
 
+    One client is created per key type and reused for the process lifetime,
+    so every service asking for the same key shares one client.
+
     Args:
         use_service_role: If True, use service role key (bypasses RLS).
                          If False, use regular key from settings.
@@ -28,11 +28,13 @@ def get_supabase_client(use_service_role: bool = False) -> Client:
     Raises:
         ValueError: If Supabase URL or key is not configured
     """
-    global _supabase_client
+    # Normalize so positional/keyword/truthy calls share a cache entry
+    return _create_supabase_client(bool(use_service_role))
 
-    if _supabase_client is not None:
-        return _supabase_client
 
+@lru_cache(maxsize=2)
+def _create_supabase_client(use_service_role: bool) -> Client:
+    """Create the Supabase client for one key type (memoized)."""
     if not settings.SUPABASE_URL:
         raise ValueError(
             "Supabase URL must be configured. "
@@ -60,13 +62,13 @@ def get_supabase_client(use_service_role: bool = False) -> Client:
         )
 
     try:
-        _supabase_client = create_client(
+        client = create_client(
             settings.SUPABASE_URL,
             api_key
         )
         logger.info(
             f"Supabase client initialized successfully (URL: {settings.SUPABASE_URL}, key: {key_type})")
-        return _supabase_client
+        return client
     except Exception as e:
         logger.error(f"Failed to initialize Supabase client: {e}")
         if "localhost" in settings.SUPABASE_URL or "127.0.0.1" in settings.SUPABASE_URL:
@@ -78,6 +80,5 @@ def get_supabase_client(use_service_role: bool = False) -> Client:
 
 
 def reset_supabase_client() -> None:
-    """Reset Supabase client (useful for testing)"""
-    global _supabase_client
-    _supabase_client = None
+    """Reset Supabase clients (useful for testing)"""
+    _create_supabase_client.cache_clear()
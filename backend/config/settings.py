@@ -103,6 +103,12 @@ class Settings(BaseSettings):
         description="Supabase service role key (legacy, use SUPABASE_SECRET_KEY instead)"
     )
 
+    # Redis settings (optional shared cache across workers)
+    REDIS_URL: Optional[str] = Field(
+        default=None,
+        description="Redis URL for the shared cache (e.g., redis://localhost:6379). In-process caches only if unset"
+    )
+
     # Vast.ai GPU server URL
     VAST_AI_SERVER_URL: Optional[str] = Field(
         default=None,
@@ -30,7 +30,7 @@ class MemoryManager:
     """Manages conversation memory using Supabase + Qdrant"""
 
     def __init__(self):
-        self.supabase = get_supabase_client()
+        self.supabase = get_supabase_client(use_service_role=True)
         from backend.core.ai.embedding.manager import get_embedding_manager
         self.embedding_manager = get_embedding_manager()
         # Note: qdrant_client is now initialized with collection creation in get_qdrant_client()
@@ -85,6 +85,8 @@ class MemoryManager:
             Conversation ID (UUID)
         """
         try:
+            timestamp = datetime.now(timezone.utc).isoformat()
+
             # Store in Supabase
             conversation_data = {
                 "user_id": user_id,
@@ -92,7 +94,7 @@ class MemoryManager:
                 "messages": [msg.model_dump() for msg in messages],
                 "summary": summary,
                 "metadata": metadata.model_dump() if hasattr(metadata, 'model_dump') else (metadata if isinstance(metadata, dict) else None),
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": timestamp
             }
 
             result = self.supabase.table("conversations").insert(
@@ -116,7 +118,7 @@ class MemoryManager:
                             "user_id": user_id,
                             "session_id": session_id,
                             "conversation_id": str(conversation_id),
-                            "timestamp": datetime.now(timezone.utc).isoformat(),
+                            "timestamp": timestamp,
                             "summary": summary,
                             "metadata": metadata.model_dump() if metadata else {}
                         }
@@ -11,7 +11,8 @@ import threading
 from qdrant_client import QdrantClient as Qdrant
 from qdrant_client.models import (
     Filter,
-    FieldCondition, MatchValue, Range
+    FieldCondition, MatchValue, Range,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType
 )
 from backend.config.settings import settings
 
@@ -728,7 +729,15 @@ def _ensure_collections_exist(client: QdrantClient) -> None:
                 vectors_config={
                     "size": embedding_dimensions,
                     "distance": "Cosine"
-                }
+                },
+                # int8 copies of the vectors kept in RAM for HNSW (4x smaller);
+                # originals stay on disk for rescoring
+                quantization_config=ScalarQuantization(
+                    scalar=ScalarQuantizationConfig(
+                        type=ScalarType.INT8,
+                        always_ram=True
+                    )
+                )
             )
             logger.info(f"Created {DOCUMENT_CHUNKS_COLLECTION} collection with {embedding_dimensions} dimensions")
         else:
@@ -25,6 +25,12 @@ def create_collection_schema(embedding_dimensions: Optional[int] = None) -> Dict
         "vectors": {
             "size": embedding_dimensions,
             "distance": "Cosine"
+        },
+        "quantization_config": {
+            "scalar": {
+                "type": "int8",
+                "always_ram": True
+            }
         }
     }
 
@@ -203,6 +203,7 @@ class Document(DocumentBase):
     page_count: Optional[int] = None
     error_message: Optional[str] = None
     content_list_path: Optional[str] = None
+    content_hash: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     indexed_at: Optional[datetime] = None
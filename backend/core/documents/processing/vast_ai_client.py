@@ -4,7 +4,7 @@ Sends documents directly to Vast.ai server for GPU-accelerated processing.
 """
 import logging
 import httpx
-from typing import List, Optional, Dict, Any
+from typing import IO, List, Optional, Dict, Any, Union
 from backend.config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -24,7 +24,7 @@ class VastAIClient:
 
     async def process_documents(
         self,
-        files: List[bytes],
+        files: List[Union[bytes, IO[bytes]]],
         filenames: List[str],
         user_id: str,
         document_ids: List[str],
@@ -36,7 +36,7 @@ class VastAIClient:
         Send documents to Vast.ai server for processing.
 
         Args:
-            files: List of PDF file contents (bytes)
+            files: List of PDF file contents (bytes or binary file objects)
             filenames: List of filenames
             user_id: User UUID string
             document_ids: List of document UUIDs (one per file)
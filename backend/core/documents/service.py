@@ -1,7 +1,7 @@
 """Document service for managing user documents."""
+import asyncio
 from typing import Optional, List, Dict, Any, Tuple
 import logging
-from datetime import datetime, timezone
 
 from backend.config.database.supabase_client import get_supabase_client
 from backend.core.documents.models import (
@@ -18,6 +18,8 @@ class DocumentService:
     def __init__(self):
         # Use service role to bypass RLS for backend operations
         self.supabase = get_supabase_client(use_service_role=True)
+        # Table builders are reusable; each query method returns a fresh builder
+        self._t_docs = self.supabase.table("user_documents")
         self.storage = SupabaseStorageClient()
 
     def create_document(
@@ -28,10 +30,23 @@ class DocumentService:
         file_extension: str,
         file_size: int,
         mime_type: str,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        document_id: Optional[str] = None,
+        content_hash: Optional[str] = None
     ) -> Document:
-        """Create a new document record."""
+        """
+        Create a new document record.
+
+        When content_hash is given and the user already has a document with
+        the same content, the existing document is returned instead (whatever
+        its status; callers retry FAILED ones).
+        """
         try:
+            if content_hash:
+                existing = self.get_document_by_hash(user_id, content_hash)
+                if existing:
+                    return existing
+
             document_data = {
                 "user_id": user_id,
                 "filename": filename,
@@ -42,9 +57,12 @@ class DocumentService:
                 "status": DocumentStatus.UPLOADED.value,
                 "metadata": metadata or {}
             }
+            if document_id:
+                document_data["id"] = document_id
+            if content_hash:
+                document_data["content_hash"] = content_hash
 
-            result = self.supabase.table(
-                "user_documents").insert(document_data).execute()
+            result = self._t_docs.insert(document_data).execute()
 
             if not result.data:
                 raise ValueError("Failed to create document record")
@@ -52,13 +70,18 @@ class DocumentService:
             return Document(**result.data[0])
 
         except Exception as e:
+            # A concurrent upload of the same file may have won the unique index
+            if content_hash:
+                existing = self.get_document_by_hash(user_id, content_hash)
+                if existing:
+                    return existing
             logger.error(f"Error creating document: {e}")
             raise
 
     def get_document(self, document_id: str, user_id: str) -> Optional[Document]:
         """Get document by ID (with user validation)."""
         try:
-            result = self.supabase.table("user_documents").select("*").eq(
+            result = self._t_docs.select("*").eq(
                 "id", document_id
             ).eq("user_id", user_id).execute()
 
@@ -70,6 +93,25 @@ class DocumentService:
             logger.error(f"Error getting document {document_id}: {e}")
             return None
 
+    def get_document_by_hash(
+        self,
+        user_id: str,
+        content_hash: str
+    ) -> Optional[Document]:
+        """Get a user's document by content hash (for upload deduplication)."""
+        try:
+            result = self._t_docs.select("*").eq(
+                "user_id", user_id
+            ).eq("content_hash", content_hash).limit(1).execute()
+
+            if result.data:
+                return Document(**result.data[0])
+            return None
+
+        except Exception as e:
+            logger.error(f"Error looking up document by hash: {e}")
+            return None
+
     def list_documents(
         self,
         user_id: str,
@@ -79,7 +121,7 @@ class DocumentService:
     ) -> Tuple[List[Document], int]:
         """List user's documents."""
         try:
-            query = self.supabase.table("user_documents").select(
+            query = self._t_docs.select(
                 "*", count="exact"
             ).eq("user_id", user_id)
 
@@ -109,16 +151,11 @@ class DocumentService:
     ) -> Optional[Document]:
         """Update document status/metadata."""
         try:
-            update_data = update.model_dump(exclude_unset=True)
-
-            # Convert datetime objects to ISO strings for Supabase
-            for key, value in update_data.items():
-                if isinstance(value, datetime):
-                    update_data[key] = value.isoformat()
-
-            update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
+            # JSON mode serializes datetimes to ISO strings for Supabase;
+            # updated_at is maintained by a database trigger
+            update_data = update.model_dump(mode="json", exclude_unset=True)
 
-            result = self.supabase.table("user_documents").update(update_data).eq(
+            result = self._t_docs.update(update_data).eq(
                 "id", document_id
             ).eq("user_id", user_id).execute()
 
@@ -171,50 +208,70 @@ class DocumentService:
             logger.error(f"Error getting document URLs for {document_id}: {e}")
             return {"original_pdf_url": None}
 
-    def delete_document(self, document_id: str, user_id: str) -> bool:
-        """Delete document and associated files."""
+    async def delete_document_async(self, document_id: str, user_id: str) -> bool:
+        """
+        Delete document and associated files.
+
+        Storage objects, Qdrant chunks and the database row are independent,
+        so the deletions run concurrently.
+        """
         try:
             # Get document to find file paths
-            document = self.get_document(document_id, user_id)
+            document = await asyncio.to_thread(
+                self.get_document, document_id, user_id)
             if not document:
                 return False
 
-            # Delete from storage
+            def delete_qdrant_chunks() -> int:
+                from backend.core.ai.vector_db.qdrant_client import get_qdrant_client
+                return get_qdrant_client().delete_document_chunks(
+                    document_id, user_id)
+
+            def delete_row() -> None:
+                self._t_docs.delete().eq(
+                    "id", document_id
+                ).eq("user_id", user_id).execute()
+
+            # (label, blocking call) pairs, run concurrently in worker threads
+            operations = [
+                ("Qdrant chunks", delete_qdrant_chunks),
+                ("database row", delete_row),
+            ]
             if document.filename:
                 storage_path = f"{user_id}/{document_id}/{document.filename}"
-                try:
-                    self.storage.delete_file(storage_path)
-                except Exception as e:
-                    logger.warning(f"Error deleting file from storage: {e}")
-
+                operations.append(
+                    ("file from storage", lambda: self.storage.delete_file(storage_path)))
             if document.content_list_path:
-                try:
-                    self.storage.delete_file(document.content_list_path)
-                except Exception as e:
+                operations.append(
+                    ("content_list from storage",
+                     lambda: self.storage.delete_file(document.content_list_path)))
+
+            results = await asyncio.gather(
+                *(asyncio.to_thread(fn) for _, fn in operations),
+                return_exceptions=True
+            )
+
+            success = True
+            for (label, _), result in zip(operations, results):
+                if isinstance(result, Exception):
                     logger.warning(
-                        f"Error deleting content_list from storage: {e}")
-
-            # Delete embeddings from Qdrant
-            try:
-                from backend.core.ai.vector_db.qdrant_client import get_qdrant_client
-                qdrant = get_qdrant_client()
-                deleted_chunks = qdrant.delete_document_chunks(
-                    document_id, user_id)
+                        f"Error deleting {label} for document {document_id}: {result}")
+                    # Only a failed row delete fails the operation
+                    if label == "database row":
+                        success = False
+                elif label == "Qdrant chunks":
+                    logger.info(
+                        f"Deleted {result} Qdrant chunks for document {document_id}")
+
+            if success:
                 logger.info(
-                    f"Deleted {deleted_chunks} Qdrant chunks for document {document_id}")
-            except Exception as e:
-                logger.warning(
-                    f"Error deleting Qdrant chunks for document {document_id}: {e}")
-                # Continue with deletion even if Qdrant deletion fails
-
-            # Delete from database
-            self.supabase.table("user_documents").delete().eq(
-                "id", document_id
-            ).eq("user_id", user_id).execute()
-
-            logger.info(f"Deleted document {document_id} for user {user_id}")
-            return True
+                    f"Deleted document {document_id} for user {user_id}")
+            return success
 
         except Exception as e:
             logger.error(f"Error deleting document {document_id}: {e}")
             return False
+
+    def delete_document(self, document_id: str, user_id: str) -> bool:
+        """Delete document and associated files (sync wrapper, not for use inside an event loop)."""
+        return asyncio.run(self.delete_document_async(document_id, user_id))
@@ -2,14 +2,25 @@
 Supabase Storage client for document operations.
 """
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, IO, Optional, Union
+import asyncio
+import base64
 import logging
+import os
+
+import httpx
 
 from backend.config.database.supabase_client import get_supabase_client
 from backend.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Supabase's TUS endpoint only accepts 6MB chunks (except the final one)
+TUS_CHUNK_SIZE = 6 * 1024 * 1024
+TUS_VERSION = "1.0.0"
+
+FileStream = Union[bytes, IO[bytes], AsyncIterator[bytes]]
+
 
 class SupabaseStorageClient:
     """Client for Supabase Storage operations."""
@@ -18,38 +29,132 @@ class SupabaseStorageClient:
         self.bucket_name = settings.DOCUMENT_STORAGE_BUCKET
         self.supabase = get_supabase_client(use_service_role=True)
 
-    def upload_file(
+    async def upload_file(
         self,
-        file_content: bytes,
+        file_stream: FileStream,
         file_path: str,
-        content_type: str
+        content_type: str,
+        size: Optional[int] = None
     ) -> str:
         """
-        Upload file to Supabase Storage.
+        Upload file to Supabase Storage using the TUS resumable endpoint.
+
+        The file is forwarded chunk by chunk, so peak memory stays at one
+        chunk regardless of file size.
 
         Args:
-            file_content: File content as bytes
+            file_stream: File content as bytes, a binary file object or an
+                async iterator of byte chunks
             file_path: Storage path (e.g., "{user_id}/{document_id}/{filename}")
             content_type: MIME type
+            size: Total size in bytes (required for async iterators)
 
         Returns:
             Storage path to file
         """
         try:
-            # Upload file
-            self.supabase.storage.from_(self.bucket_name).upload(
-                path=file_path,
-                file=file_content,
-                file_options={"content-type": content_type}
-            )
-
-            logger.info(f"Uploaded file to: {file_path}")
+            size = self._resolve_size(file_stream, size)
+            api_key = settings.SUPABASE_SECRET_KEY or settings.SUPABASE_SERVICE_KEY
+            auth_headers = {
+                "apikey": api_key,
+                "Authorization": f"Bearer {api_key}",
+                "Tus-Resumable": TUS_VERSION,
+            }
+            upload_metadata = {
+                "bucketName": self.bucket_name,
+                "objectName": file_path,
+                "contentType": content_type,
+            }
+
+            async with httpx.AsyncClient(timeout=60.0) as client:
+                # Create the upload session
+                response = await client.post(
+                    f"{settings.SUPABASE_URL.rstrip('/')}/storage/v1/upload/resumable",
+                    headers={
+                        **auth_headers,
+                        "Upload-Length": str(size),
+                        "Upload-Metadata": ",".join(
+                            f"{key} {base64.b64encode(value.encode()).decode()}"
+                            for key, value in upload_metadata.items()
+                        ),
+                        "x-upsert": "false",
+                    }
+                )
+                response.raise_for_status()
+                upload_url = response.url.join(response.headers["Location"])
+
+                # Stream chunks at increasing offsets
+                offset = 0
+                async for chunk in self._iter_chunks(file_stream, TUS_CHUNK_SIZE):
+                    response = await client.patch(
+                        upload_url,
+                        content=chunk,
+                        headers={
+                            **auth_headers,
+                            "Upload-Offset": str(offset),
+                            "Content-Type": "application/offset+octet-stream",
+                        }
+                    )
+                    response.raise_for_status()
+                    offset = int(response.headers.get(
+                        "Upload-Offset", offset + len(chunk)))
+
+            if offset != size:
+                raise ValueError(
+                    f"Uploaded {offset} bytes but expected {size} bytes")
+
+            logger.info(f"Uploaded file to: {file_path} ({size} bytes)")
             return file_path
 
         except Exception as e:
             logger.error(f"Error uploading file {file_path}: {e}")
             raise
 
+    @staticmethod
+    def _resolve_size(file_stream: FileStream, size: Optional[int]) -> int:
+        """Determine the total upload size required by the TUS protocol."""
+        if size is not None:
+            return size
+        if isinstance(file_stream, (bytes, bytearray, memoryview)):
+            return len(file_stream)
+        if hasattr(file_stream, "seek") and hasattr(file_stream, "tell"):
+            position = file_stream.tell()
+            file_stream.seek(0, os.SEEK_END)
+            end = file_stream.tell()
+            file_stream.seek(position)
+            return end - position
+        raise ValueError("size is required when uploading from an async iterator")
+
+    @staticmethod
+    async def _iter_chunks(
+        file_stream: FileStream,
+        chunk_size: int
+    ) -> AsyncIterator[bytes]:
+        """Re-slice any supported file source into fixed-size chunks."""
+        async def source() -> AsyncIterator[bytes]:
+            if isinstance(file_stream, (bytes, bytearray, memoryview)):
+                view = memoryview(file_stream)
+                for start in range(0, len(view), chunk_size):
+                    yield bytes(view[start:start + chunk_size])
+            elif hasattr(file_stream, "read"):
+                while True:
+                    piece = await asyncio.to_thread(file_stream.read, chunk_size)
+                    if not piece:
+                        break
+                    yield piece
+            else:
+                async for piece in file_stream:
+                    yield piece
+
+        buffer = bytearray()
+        async for piece in source():
+            buffer += piece
+            while len(buffer) >= chunk_size:
+                yield bytes(buffer[:chunk_size])
+                del buffer[:chunk_size]
+        if buffer:
+            yield bytes(buffer)
+
     def download_file(self, file_path: str) -> bytes:
         """
         Download file from Supabase Storage.
@@ -1,10 +1,15 @@
 """Subscription service for managing user subscriptions and Stripe integration."""
 
+from functools import cache
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 import logging
 
 from backend.config.database.supabase_client import get_supabase_client
+from backend.config.settings import settings
 from backend.core.payments.stripe_client import get_stripe_client
+from backend.core.usage.rate_limiter import clear_over_quota
+from backend.core.users.service import user_service
 
 logger = logging.getLogger(__name__)
 
@@ -25,17 +30,46 @@ SUBSCRIPTION_TIERS = {
     }
 }
 
+# Read-only, lowercase-keyed view for hot-path lookups
+_TIERS = MappingProxyType(
+    {k.lower(): v for k, v in SUBSCRIPTION_TIERS.items()})
+
+# Map Stripe subscription status to our status
+_STATUS_MAP = MappingProxyType({
+    "active": "active",
+    "canceled": "cancelled",
+    "past_due": "past_due",
+    "trialing": "trialing",
+    "unpaid": "past_due"
+})
+
+
+@cache
+def _price_map() -> Dict[str, str]:
+    """Map configured Stripe price IDs to tiers (unset price IDs are skipped)."""
+    price_map = {}
+    for tier, setting_name in (
+        ("pro", "STRIPE_PRO_PRICE_ID"),
+        ("enterprise", "STRIPE_ENTERPRISE_PRICE_ID"),
+    ):
+        price_id = getattr(settings, setting_name, None)
+        if price_id:
+            price_map[price_id] = tier
+    return price_map
+
 
 class SubscriptionService:
     """Service for subscription management operations."""
 
     def __init__(self):
         self.supabase = get_supabase_client(use_service_role=True)
+        # Table builders are reusable; each query method returns a fresh builder
+        self._t_users = self.supabase.table("users")
         self.stripe = get_stripe_client()
 
     def get_subscription_tier_info(self, tier: str) -> Optional[Dict[str, Any]]:
         """Get subscription tier information."""
-        return SUBSCRIPTION_TIERS.get(tier.lower())
+        return _TIERS.get(tier if tier.islower() else tier.lower())
 
     def create_stripe_customer(
         self,
@@ -54,7 +88,7 @@ class SubscriptionService:
             )
 
             # Update user profile with Stripe customer ID
-            self.supabase.table("users").update({
+            self._t_users.update({
                 "stripe_customer_id": customer.id
             }).eq("id", user_id).execute()
 
@@ -73,7 +107,7 @@ class SubscriptionService:
         """Create a Stripe subscription for a user."""
         try:
             # Get user profile
-            user_result = self.supabase.table("users").select(
+            user_result = self._t_users.select(
                 "*").eq("id", user_id).execute()
             if not user_result.data:
                 logger.error(f"User {user_id} not found")
@@ -105,12 +139,15 @@ class SubscriptionService:
             tier = self._get_tier_from_price_id(price_id)
 
             # Update user profile
-            self.supabase.table("users").update({
+            self._t_users.update({
                 "stripe_subscription_id": subscription.id,
                 "subscription_tier": tier,
                 "subscription_status": subscription.status,
-                "monthly_query_limit": SUBSCRIPTION_TIERS.get(tier, {}).get("monthly_query_limit", 10)
+                "monthly_query_limit": _TIERS.get(tier, {}).get("monthly_query_limit", 10)
             }).eq("id", user_id).execute()
+            # New limit applies immediately
+            user_service.invalidate_user_profiles([user_id])
+            clear_over_quota(user_id)
 
             logger.info(
                 f"Created subscription {subscription.id} for user {user_id}")
@@ -127,13 +164,13 @@ class SubscriptionService:
     def cancel_subscription(self, user_id: str) -> bool:
         """Cancel a user's subscription."""
         try:
-            user_result = self.supabase.table("users").select(
-                "*").eq("id", user_id).execute()
+            user_result = self._t_users.select(
+                "stripe_subscription_id").eq("id", user_id).execute()
             if not user_result.data:
                 return False
 
-            user = user_result.data[0]
-            stripe_subscription_id = user.get("stripe_subscription_id")
+            stripe_subscription_id = user_result.data[0].get(
+                "stripe_subscription_id")
 
             if not stripe_subscription_id:
                 logger.warning(f"User {user_id} has no active subscription")
@@ -145,10 +182,15 @@ class SubscriptionService:
                 cancel_at_period_end=True
             )
 
-            # Update user profile
-            self.supabase.table("users").update({
+            # Update user profile (match count only, no row payload)
+            result = self._t_users.update({
                 "subscription_status": "cancelled"
-            }).eq("id", user_id).execute()
+            }, count="exact", returning="minimal").eq("id", user_id).execute()
+
+            if not result.count:
+                logger.warning(
+                    f"User {user_id} disappeared while cancelling subscription")
+                return False
 
             logger.info(
                 f"Cancelled subscription {stripe_subscription_id} for user {user_id}")
@@ -164,22 +206,15 @@ class SubscriptionService:
     ) -> bool:
         """Update subscription status from Stripe webhook."""
         try:
-            # Map Stripe status to our status
-            status_map = {
-                "active": "active",
-                "canceled": "cancelled",
-                "past_due": "past_due",
-                "trialing": "trialing",
-                "unpaid": "past_due"
-            }
-            our_status = status_map.get(status, "active")
+            our_status = _STATUS_MAP.get(status, "active")
 
-            # Update user profile
-            result = self.supabase.table("users").update({
+            # Update user profile (match count only, no row payload)
+            result = self._t_users.update({
                 "subscription_status": our_status
-            }).eq("stripe_subscription_id", stripe_subscription_id).execute()
+            }, count="exact", returning="minimal").eq(
+                "stripe_subscription_id", stripe_subscription_id).execute()
 
-            if result.data:
+            if result.count:
                 logger.info(
                     f"Updated subscription {stripe_subscription_id} to status {our_status}")
                 return True
@@ -190,15 +225,10 @@ class SubscriptionService:
 
     def _get_tier_from_price_id(self, price_id: str) -> str:
         """Get subscription tier from Stripe price ID."""
-        from backend.config.settings import settings
-
-        # Check against configured price IDs
-        if hasattr(settings, 'STRIPE_PRO_PRICE_ID') and settings.STRIPE_PRO_PRICE_ID == price_id:
-            return "pro"
-        elif hasattr(settings, 'STRIPE_ENTERPRISE_PRICE_ID') and settings.STRIPE_ENTERPRISE_PRICE_ID == price_id:
-            return "enterprise"
+        return _price_map().get(price_id) or self._get_tier_from_stripe_price(price_id)
 
-        # Fallback: try to get from Stripe API
+    def _get_tier_from_stripe_price(self, price_id: str) -> str:
+        """Fallback: read the tier from the Stripe price metadata."""
         try:
             price = self.stripe.Price.retrieve(price_id)
             tier_metadata = price.metadata.get('tier', 'pro')
@@ -211,7 +241,7 @@ class SubscriptionService:
     def get_user_subscription(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get user's subscription information."""
         try:
-            user_result = self.supabase.table("users").select(
+            user_result = self._t_users.select(
                 "*").eq("id", user_id).execute()
             if not user_result.data:
                 return None
@@ -5,16 +5,49 @@ This module enforces subscription-based query limits by checking if users
 have remaining queries for the current month. It raises HTTP 429 errors
 when limits are exceeded, providing clear error messages to guide users
 toward subscription upgrades.
+
+Users found over quota are remembered in Redis (when configured) for a few
+minutes, so repeated requests are refused without a profile lookup.
 """
 
 from typing import Tuple, Optional
+from datetime import datetime, timezone
 import logging
 from fastapi import HTTPException, status
 
+from backend.config.database.redis_client import get_redis_client
 from backend.core.users.service import user_service
 
 logger = logging.getLogger(__name__)
 
+OVER_QUOTA_KEY_PREFIX = "over_quota:"
+OVER_QUOTA_TTL_SECONDS = 300
+
+
+def _usage_limit_exceeded(queries_used: Optional[int], query_limit: Optional[int]) -> HTTPException:
+    """Build the 429 error returned when the monthly limit is reached."""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail={
+            "error": "Usage limit exceeded",
+            "queries_used": queries_used,
+            "query_limit": query_limit,
+            "message": f"You have reached your monthly query limit of {query_limit}. Please upgrade your subscription to continue."
+        }
+    )
+
+
+def _seconds_until_month_reset() -> int:
+    """Seconds until the start of next month (UTC), when usage is reset."""
+    now = datetime.now(timezone.utc)
+    if now.month == 12:
+        next_month = now.replace(year=now.year + 1, month=1, day=1,
+                                 hour=0, minute=0, second=0, microsecond=0)
+    else:
+        next_month = now.replace(month=now.month + 1, day=1,
+                                 hour=0, minute=0, second=0, microsecond=0)
+    return max(1, int((next_month - now).total_seconds()))
+
 
 def check_usage_limit(user_id: str) -> Tuple[bool, Optional[int], Optional[int]]:
     """
@@ -27,18 +60,63 @@ def check_usage_limit(user_id: str) -> Tuple[bool, Optional[int], Optional[int]]
         Tuple of (has_queries_remaining, queries_used, query_limit)
         Raises HTTPException if limit exceeded
     """
+    redis_client = get_redis_client()
+    key = f"{OVER_QUOTA_KEY_PREFIX}{user_id}"
+
+    # Fast path: user was recently found over quota
+    if redis_client is not None:
+        try:
+            marker = redis_client.get(key)
+        except Exception as e:
+            logger.warning("Error reading over-quota marker: %s", e)
+            marker = None
+        if marker:
+            queries_used, query_limit = (
+                int(value) for value in marker.decode("utf-8").split(":"))
+            raise _usage_limit_exceeded(queries_used, query_limit)
+
     has_remaining, queries_used, query_limit = user_service.check_query_limit(
         user_id)
 
     if not has_remaining:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail={
-                "error": "Usage limit exceeded",
-                "queries_used": queries_used,
-                "query_limit": query_limit,
-                "message": f"You have reached your monthly query limit of {query_limit}. Please upgrade your subscription to continue."
-            }
-        )
+        if redis_client is not None and queries_used is not None and query_limit is not None:
+            try:
+                redis_client.setex(
+                    key,
+                    min(OVER_QUOTA_TTL_SECONDS, _seconds_until_month_reset()),
+                    f"{queries_used}:{query_limit}"
+                )
+            except Exception as e:
+                logger.warning("Error writing over-quota marker: %s", e)
+        raise _usage_limit_exceeded(queries_used, query_limit)
 
     return has_remaining, queries_used, query_limit
+
+
+def clear_over_quota(user_id: str) -> None:
+    """
+    Forget that a user is over quota (after a usage reset or plan upgrade).
+
+    Args:
+        user_id: User UUID string
+    """
+    redis_client = get_redis_client()
+    if redis_client is None:
+        return
+    try:
+        redis_client.delete(f"{OVER_QUOTA_KEY_PREFIX}{user_id}")
+    except Exception as e:
+        logger.warning("Error clearing over-quota marker: %s", e)
+
+
+def clear_all_over_quota() -> None:
+    """Forget every over-quota marker (after the monthly usage reset)."""
+    redis_client = get_redis_client()
+    if redis_client is None:
+        return
+    try:
+        keys = list(redis_client.scan_iter(match=f"{OVER_QUOTA_KEY_PREFIX}*"))
+        if keys:
+            redis_client.delete(*keys)
+    except Exception as e:
+        logger.warning("Error clearing over-quota markers: %s", e)
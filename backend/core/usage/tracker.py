@@ -9,17 +9,35 @@ This module tracks individual query executions, recording:
 
 It also provides aggregated statistics for user analytics dashboards,
 including success rates, cost trends, and usage patterns over time.
+
+Query records are buffered in memory and written by a background thread
+in multi-row inserts, so recording a query never blocks the request path.
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+import atexit
 import logging
+import queue
+import threading
+import time
 from datetime import datetime, timezone
 
 from backend.config.database.supabase_client import get_supabase_client
+from backend.core.usage.rate_limiter import clear_all_over_quota, clear_over_quota
 from backend.core.users.service import user_service
 
 logger = logging.getLogger(__name__)
 
+# Maximum rows per multi-row insert
+BATCH_SIZE = 500
+# Maximum time a queued row waits before its batch is flushed
+FLUSH_INTERVAL_SECONDS = 0.25
+
+# Stored text limits (characters), applied on the flusher thread
+QUERY_TEXT_MAX_CHARS = 1000
+RESPONSE_TEXT_MAX_CHARS = 5000
+ERROR_MESSAGE_MAX_CHARS = 500
+
 
 class UsageTracker:
     """
@@ -32,6 +50,13 @@ class UsageTracker:
     def __init__(self):
         self.supabase = get_supabase_client(use_service_role=True)
 
+        # Buffered query_usage entries (tuples), drained by the flusher thread
+        self._queue: queue.Queue = queue.Queue()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="usage-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.flush)
+
     def record_query(
         self,
         user_id: str,
@@ -45,6 +70,9 @@ class UsageTracker:
         """
         Record a query in the usage tracking system.
 
+        The row is queued and written asynchronously in a batch; text
+        truncation and row building happen on the flusher thread.
+
         Args:
             user_id: User UUID string
             query_text: The query that was executed
@@ -55,34 +83,81 @@ class UsageTracker:
             error_message: Optional error message if query failed
 
         Returns:
-            True if successful, False otherwise
+            True if the query was queued, False otherwise
         """
         try:
-            # Record in query_usage table
-            self.supabase.table("query_usage").insert({
-                "user_id": user_id,
-                "query_text": query_text[:1000],  # Limit length
-                "response_text": response_text[:5000] if response_text else None,
-                "cost_usd": cost_usd,
-                "tokens_used": tokens_used,
-                "success": success,
-                "error_message": error_message[:500] if error_message else None
-            }).execute()
-
-            # Increment user's query count
-            user_service.increment_query_count(user_id)
-
-            logger.debug(
-                f"Recorded query for user {user_id}, cost: ${cost_usd:.4f}")
+            self._queue.put_nowait((
+                user_id, query_text, response_text, cost_usd,
+                tokens_used, success, error_message
+            ))
             return True
         except Exception as e:
-            logger.error(f"Error recording query usage: {e}")
+            logger.error("Error queueing query usage: %s", e)
             return False
 
+    def flush(self) -> None:
+        """Write all queued rows now (called at process exit)."""
+        rows: List[tuple] = []
+        while True:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            if len(rows) >= BATCH_SIZE:
+                self._write_batch(rows)
+                rows = []
+        if rows:
+            self._write_batch(rows)
+
+    def _flush_loop(self) -> None:
+        """Drain the queue in batches of BATCH_SIZE or every FLUSH_INTERVAL_SECONDS."""
+        while True:
+            rows = [self._queue.get()]
+            deadline = time.monotonic() + FLUSH_INTERVAL_SECONDS
+            while len(rows) < BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    rows.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write_batch(rows)
+
+    @staticmethod
+    def _build_row(entry: tuple) -> Dict[str, Any]:
+        """Build a query_usage row from a queued entry, truncating long text."""
+        (user_id, query_text, response_text, cost_usd,
+         tokens_used, success, error_message) = entry
+        return {
+            "user_id": user_id,
+            "query_text": query_text[:QUERY_TEXT_MAX_CHARS],
+            "response_text": response_text[:RESPONSE_TEXT_MAX_CHARS] if response_text else None,
+            "cost_usd": cost_usd,
+            "tokens_used": tokens_used,
+            "success": success,
+            "error_message": error_message[:ERROR_MESSAGE_MAX_CHARS] if error_message else None
+        }
+
+    def _write_batch(self, entries: List[tuple]) -> None:
+        """Insert entries in one request (a trigger bumps users' query counts)."""
+        try:
+            rows = [self._build_row(entry) for entry in entries]
+            self.supabase.table("query_usage").insert(rows).execute()
+        except Exception as e:
+            logger.error("Error recording %d query usage rows: %s", len(entries), e)
+            return
+
+        # Cached profiles now hold stale query counts
+        user_service.invalidate_user_profiles({entry[0] for entry in entries})
+
+        logger.debug("Recorded %d queries", len(entries))
+
     def get_user_usage_stats(
         self,
         user_id: str,
-        days: int = 30
+        days: int = 30,
+        user_profile: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Get user's usage statistics for the last N days using SQL aggregation.
@@ -93,6 +168,7 @@ class UsageTracker:
         Args:
             user_id: User UUID string
             days: Number of days to look back
+            user_profile: Already-loaded profile for limits (fetched if None)
 
         Returns:
             Dictionary with usage statistics
@@ -111,7 +187,7 @@ class UsageTracker:
                 stats = rpc_result.data[0]
 
                 # Get user profile for limits
-                user = user_service.get_user_profile(user_id)
+                user = user_profile or user_service.get_user_profile(user_id)
                 monthly_limit = user.get(
                     "monthly_query_limit", 10) if user else 10
                 queries_used = user.get(
@@ -131,7 +207,7 @@ class UsageTracker:
                 }
 
             # Return empty stats if no data
-            user = user_service.get_user_profile(user_id)
+            user = user_profile or user_service.get_user_profile(user_id)
             monthly_limit = user.get("monthly_query_limit", 10) if user else 10
             queries_used = user.get(
                 "queries_used_this_month", 0) if user else 0
@@ -149,7 +225,7 @@ class UsageTracker:
                 "period_days": days
             }
         except Exception as e:
-            logger.error(f"Error getting usage stats: {e}")
+            logger.error("Error getting usage stats: %s", e)
             return {
                 "total_queries": 0,
                 "successful_queries": 0,
@@ -163,6 +239,68 @@ class UsageTracker:
                 "period_days": days
             }
 
+    def get_user_usage_stats_bulk(
+        self,
+        user_ids: List[str],
+        days: int = 30
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get usage statistics for many users with one aggregation query.
+
+        Stats come from a single grouped RPC call and limits from a single
+        users select, instead of two round-trips per user.
+
+        Args:
+            user_ids: User UUID strings
+            days: Number of days to look back
+
+        Returns:
+            Dictionary mapping user ID to the same statistics as get_user_usage_stats
+        """
+        if not user_ids:
+            return {}
+
+        try:
+            rpc_result = self.supabase.rpc(
+                'get_user_usage_stats_bulk',
+                {
+                    'user_ids': list(user_ids),
+                    'days_param': days
+                }
+            ).execute()
+            stats_by_user = {row["user_id"]: row for row in rpc_result.data or []}
+
+            users_result = self.supabase.table("users").select(
+                "id, monthly_query_limit, queries_used_this_month"
+            ).in_("id", list(user_ids)).execute()
+            users_by_id = {row["id"]: row for row in users_result.data or []}
+
+            results = {}
+            for user_id in user_ids:
+                stats = stats_by_user.get(user_id, {})
+                user = users_by_id.get(user_id)
+                monthly_limit = user.get(
+                    "monthly_query_limit", 10) if user else 10
+                queries_used = user.get(
+                    "queries_used_this_month", 0) if user else 0
+
+                results[user_id] = {
+                    "total_queries": int(stats.get("total_queries", 0)),
+                    "successful_queries": int(stats.get("successful_queries", 0)),
+                    "failed_queries": int(stats.get("failed_queries", 0)),
+                    "total_cost_usd": float(stats.get("total_cost_usd", 0)),
+                    "total_tokens": int(stats.get("total_tokens", 0)),
+                    "average_cost_per_query": float(stats.get("average_cost_per_query", 0)),
+                    "monthly_limit": monthly_limit,
+                    "queries_used_this_month": queries_used,
+                    "queries_remaining": max(0, monthly_limit - queries_used),
+                    "period_days": days
+                }
+            return results
+        except Exception as e:
+            logger.error("Error getting bulk usage stats: %s", e)
+            return {}
+
     def reset_monthly_usage(self, user_id: str) -> bool:
         """
         Reset monthly usage counter for a user.
@@ -180,13 +318,39 @@ class UsageTracker:
                 "queries_used_this_month": 0,
                 "last_query_reset": datetime.now(timezone.utc).isoformat()
             }).eq("id", user_id).execute()
+            user_service.invalidate_user_profiles([user_id])
+            clear_over_quota(user_id)
 
-            logger.info(f"Reset monthly usage for user {user_id}")
+            logger.info("Reset monthly usage for user %s", user_id)
             return True
         except Exception as e:
-            logger.error(f"Error resetting monthly usage: {e}")
+            logger.error("Error resetting monthly usage: %s", e)
             return False
 
+    def reset_monthly_usage_all(self) -> int:
+        """
+        Reset monthly usage counters for every user not yet reset this month.
+
+        Runs the reset_monthly_query_counts SQL function (one UPDATE instead
+        of a per-user loop); call this from the monthly scheduled job. Cached
+        profiles and over-quota markers are cleared in every worker afterwards.
+
+        Returns:
+            Number of users reset (0 on error)
+        """
+        try:
+            result = self.supabase.rpc("reset_monthly_query_counts").execute()
+        except Exception as e:
+            logger.error("Error resetting monthly usage for all users: %s", e)
+            return 0
+
+        user_service.invalidate_all_user_profiles()
+        clear_all_over_quota()
+
+        reset_count = result.data or 0
+        logger.info("Reset monthly usage for %d users", reset_count)
+        return reset_count
+
 
 # Global usage tracker instance
 usage_tracker = UsageTracker()
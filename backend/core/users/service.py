@@ -1,6 +1,7 @@
 """User service for managing user profiles and operations."""
 
-from typing import Optional, Dict, Any
+from contextvars import ContextVar, Token
+from typing import Optional, Dict, Any, Iterable
 import logging
 
 from backend.config.database.supabase_client import get_supabase_client
@@ -8,6 +9,27 @@ from backend.core.utils.cache import user_profile_cache
 
 logger = logging.getLogger(__name__)
 
+# Per-request profile memo (user_id -> profile), set up by the API middleware
+_request_profiles: ContextVar[Optional[Dict[str, Dict[str, Any]]]] = ContextVar(
+    "_request_profiles", default=None)
+
+
+def begin_request_profile_cache() -> Token:
+    """Start an empty profile memo for the current request."""
+    return _request_profiles.set({})
+
+
+def end_request_profile_cache(token: Token) -> None:
+    """Discard the current request's profile memo."""
+    _request_profiles.reset(token)
+
+
+def _forget_request_profile(user_id: str) -> None:
+    """Drop a profile from the current request's memo, if any."""
+    memo = _request_profiles.get()
+    if memo is not None:
+        memo.pop(user_id, None)
+
 
 class UserService:
     """Service for user management operations"""
@@ -19,11 +41,16 @@ class UserService:
     def get_user_profile(self, user_id: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """Get user profile by ID with optional caching."""
         cache_key = f"user_profile:{user_id}"
+        memo = _request_profiles.get() if use_cache else None
 
-        # Try cache first if enabled
+        # Try request memo, then shared cache, if enabled
+        if memo is not None and user_id in memo:
+            return memo[user_id]
         if use_cache:
             cached_profile = user_profile_cache.get(cache_key)
             if cached_profile is not None:
+                if memo is not None:
+                    memo[user_id] = cached_profile
                 return cached_profile
 
         try:
@@ -35,10 +62,12 @@ class UserService:
                 # Cache the result
                 if use_cache:
                     user_profile_cache.set(cache_key, profile)
+                    if memo is not None:
+                        memo[user_id] = profile
                 return profile
             return None
         except Exception as e:
-            logger.error(f"Error getting user profile: {e}")
+            logger.error("Error getting user profile: %s", e)
             return None
 
     def create_user_profile(
@@ -67,11 +96,11 @@ class UserService:
                 # Cache the newly created profile
                 cache_key = f"user_profile:{user_id}"
                 user_profile_cache.set(cache_key, profile)
-                logger.info(f"Created user profile for {user_id}")
+                logger.info("Created user profile for %s", user_id)
                 return profile
             raise ValueError("Failed to create user profile")
         except Exception as e:
-            logger.error(f"Error creating user profile: {e}")
+            logger.error("Error creating user profile: %s", e)
             raise
 
     def update_user_profile(
@@ -85,35 +114,29 @@ class UserService:
                 updates).eq("id", user_id).execute()
             if result.data:
                 profile = result.data[0]
-                # Update cache with new profile data
+                # Invalidate cache in every worker (next read refetches)
                 cache_key = f"user_profile:{user_id}"
-                user_profile_cache.set(cache_key, profile)
-                logger.info(f"Updated user profile for {user_id}")
+                user_profile_cache.delete(cache_key)
+                _forget_request_profile(user_id)
+                logger.info("Updated user profile for %s", user_id)
                 return profile
             return None
         except Exception as e:
-            logger.error(f"Error updating user profile: {e}")
+            logger.error("Error updating user profile: %s", e)
             raise
 
-    def increment_query_count(self, user_id: str) -> bool:
-        """Increment the user's query count for the current month using atomic SQL update."""
-        try:
-            # Use atomic SQL increment via RPC function - single query instead of read + write
-            # This prevents race conditions and reduces database round-trips by 50%
-            result = self.supabase.rpc(
-                'increment_user_query_count',
-                {'user_id_param': user_id}
-            ).execute()
-
-            if result.data and len(result.data) > 0:
-                # Invalidate cache since query count changed
-                cache_key = f"user_profile:{user_id}"
-                user_profile_cache.delete(cache_key)
-                return True
-            return False
-        except Exception as e:
-            logger.error(f"Error incrementing query count: {e}")
-            return False
+    def invalidate_user_profiles(self, user_ids: Iterable[str]) -> None:
+        """Drop cached profiles, e.g. after their query counts changed in the database."""
+        for user_id in user_ids:
+            user_profile_cache.delete(f"user_profile:{user_id}")
+            _forget_request_profile(user_id)
+
+    def invalidate_all_user_profiles(self) -> None:
+        """Drop every cached profile, in all workers (e.g. after a bulk reset)."""
+        user_profile_cache.clear()
+        memo = _request_profiles.get()
+        if memo is not None:
+            memo.clear()
 
     def check_query_limit(self, user_id: str) -> tuple[bool, Optional[int], Optional[int]]:
         """Check if user has remaining queries for the month."""
@@ -128,7 +151,7 @@ class UserService:
             has_remaining = queries_used < query_limit
             return has_remaining, queries_used, query_limit
         except Exception as e:
-            logger.error(f"Error checking query limit: {e}")
+            logger.error("Error checking query limit: %s", e)
             return False, None, None
 
 
@@ -2,9 +2,9 @@
 Utility modules for backend core functionality.
 """
 
-from backend.core.utils.cache import SimpleCache, user_profile_cache
+from backend.core.utils.cache import SimpleCache, RedisCache, user_profile_cache
 
-__all__ = ['SimpleCache', 'user_profile_cache']
+__all__ = ['SimpleCache', 'RedisCache', 'user_profile_cache']
 
 
 
@@ -2,7 +2,8 @@
 Async Logging Utility - Non-blocking logging for performance optimization.
 
 Uses a background thread with a queue to handle log writes asynchronously,
-preventing I/O operations from blocking the main workflow.
+preventing I/O operations from blocking the main workflow. The queue is
+bounded: records are dropped (and counted) rather than blocking callers.
 """
 
 import logging
@@ -10,6 +11,50 @@ import queue
 import threading
 from logging.handlers import QueueHandler, QueueListener
 
+# Maximum number of pending log records per logger
+LOG_QUEUE_MAXSIZE = 10_000
+# How often dropped-record counts are reported
+DROP_REPORT_INTERVAL_SECONDS = 10.0
+
+
+class FastQueueHandler(QueueHandler):
+    """
+    QueueHandler that does no work on the logging thread.
+
+    Records are enqueued as-is (formatting happens on the listener thread)
+    and dropped without blocking when the queue is full.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Records stay in-process, so skip the default message/traceback
+        # pre-formatting (only needed when records are pickled)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+
+    def pop_dropped(self) -> int:
+        """Return and reset the number of dropped records."""
+        with self._dropped_lock:
+            dropped, self._dropped = self._dropped, 0
+        return dropped
+
+
+class _BlockingSentinelListener(QueueListener):
+    """QueueListener whose stop sentinel waits for room in a bounded queue."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
 
 class AsyncLogger:
     """
@@ -29,8 +74,8 @@ class AsyncLogger:
         self.name = name
         self.level = level
 
-        # Create queue for log records
-        self.log_queue = queue.Queue(-1)  # Unlimited queue size
+        # Create bounded queue for log records
+        self.log_queue = queue.Queue(maxsize=LOG_QUEUE_MAXSIZE)
 
         # Create standard logger
         self.logger = logging.getLogger(name)
@@ -39,10 +84,10 @@ class AsyncLogger:
         # Remove existing handlers to avoid duplicates
         self.logger.handlers.clear()
 
-        # Create queue handler (adds records to queue)
-        queue_handler = QueueHandler(self.log_queue)
-        queue_handler.setLevel(level)
-        self.logger.addHandler(queue_handler)
+        # Create queue handler (adds records to queue, drops on overflow)
+        self.queue_handler = FastQueueHandler(self.log_queue)
+        self.queue_handler.setLevel(level)
+        self.logger.addHandler(self.queue_handler)
 
         # Create standard handlers for actual output
         # Use StreamHandler for console output
@@ -53,9 +98,10 @@ class AsyncLogger:
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         console_handler.setFormatter(formatter)
+        self._console_handler = console_handler
 
         # QueueListener processes queued records in background thread
-        self.listener = QueueListener(
+        self.listener = _BlockingSentinelListener(
             self.log_queue,
             console_handler,
             respect_handler_level=True
@@ -65,6 +111,31 @@ class AsyncLogger:
         self.listener.start()
         self._stopped = False
 
+        # Report dropped records periodically so the loss is visible
+        self._stop_event = threading.Event()
+        self._drop_reporter = threading.Thread(
+            target=self._report_dropped_loop,
+            name=f"async-logger-drops-{name}",
+            daemon=True
+        )
+        self._drop_reporter.start()
+
+    def _report_dropped_loop(self):
+        """Emit a warning with the dropped-record count until stopped."""
+        while not self._stop_event.wait(DROP_REPORT_INTERVAL_SECONDS):
+            self._report_dropped()
+
+    def _report_dropped(self):
+        """Write a 'dropped N records' warning straight to the output handler."""
+        dropped = self.queue_handler.pop_dropped()
+        if not dropped:
+            return
+        record = self.logger.makeRecord(
+            self.name, logging.WARNING, __file__, 0,
+            "Dropped %d log records (async log queue full)", (dropped,), None
+        )
+        self._console_handler.handle(record)
+
     def get_logger(self) -> logging.Logger:
         """Get the underlying logger instance."""
         return self.logger
@@ -78,9 +149,11 @@ class AsyncLogger:
 
         try:
             self._stopped = True
+            self._stop_event.set()
             # Stop the listener (this will finish processing queued records)
             # QueueListener.stop() sets a flag and waits for the thread to finish
             self.listener.stop()
+            self._report_dropped()
         except Exception:
             # Ignore errors during shutdown (listener may already be stopped)
             # AttributeError: listener may be None
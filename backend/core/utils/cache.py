@@ -2,27 +2,22 @@
 Simple in-memory cache utility for frequently accessed data.
 
 Provides TTL-based caching to reduce database queries for user profiles
-and other frequently accessed data.
+and other frequently accessed data. When Redis is configured, RedisCache
+shares entries across workers and keeps a small in-process copy in front.
 """
 
-from typing import Optional, Dict, Any, Callable
-from datetime import datetime, timedelta, timezone
+from typing import Optional, Any, Callable, List, Tuple
 import threading
+import time
 import logging
+import weakref
+from collections import OrderedDict
 
-logger = logging.getLogger(__name__)
-
-
-class CacheEntry:
-    """Cache entry with expiration time"""
+import orjson
 
-    def __init__(self, value: Any, ttl_seconds: int):
-        self.value = value
-        self.expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
+from backend.config.database.redis_client import get_redis_client
 
-    def is_expired(self) -> bool:
-        """Check if cache entry has expired"""
-        return datetime.now(timezone.utc) >= self.expires_at
+logger = logging.getLogger(__name__)
 
 
 class SimpleCache:
@@ -30,19 +25,63 @@ class SimpleCache:
     Thread-safe in-memory cache with TTL support.
 
     Provides simple caching for frequently accessed data like user profiles.
-    Automatically expires entries after TTL.
+    Automatically expires entries after TTL. Keys are spread over
+    independently locked shards so concurrent requests rarely contend.
+    Each shard is an LRU bounded by maxsize, and a background thread sweeps
+    expired entries so memory does not grow with dead keys.
     """
 
-    def __init__(self, default_ttl_seconds: int = 300):
+    NUM_SHARDS = 16  # Power of two (shard index is a bit mask)
+    SWEEP_INTERVAL_SECONDS = 60
+
+    def __init__(self, default_ttl_seconds: int = 300, maxsize: int = 10_000):
         """
         Initialize cache.
 
         Args:
             default_ttl_seconds: Default time-to-live in seconds (default: 5 minutes)
+            maxsize: Maximum number of entries, split evenly across shards
         """
-        self._cache: Dict[str, CacheEntry] = {}
-        self._lock = threading.Lock()
+        self._shards: List[Tuple[threading.Lock, "OrderedDict[str, Tuple[Any, float]]"]] = [
+            (threading.Lock(), OrderedDict()) for _ in range(self.NUM_SHARDS)
+        ]
         self.default_ttl = default_ttl_seconds
+        self._shard_maxsize = max(1, -(-maxsize // self.NUM_SHARDS))
+
+        # Sweeper only holds a weak reference so unused caches can be collected
+        threading.Thread(
+            target=SimpleCache._sweep_loop,
+            args=(weakref.ref(self),),
+            name="cache-sweeper",
+            daemon=True,
+        ).start()
+
+    def _shard(self, key: str) -> Tuple[threading.Lock, "OrderedDict[str, Tuple[Any, float]]"]:
+        """Get the (lock, dict) pair that owns a key"""
+        return self._shards[hash(key) & (self.NUM_SHARDS - 1)]
+
+    @staticmethod
+    def _sweep_loop(cache_ref: "weakref.ref[SimpleCache]") -> None:
+        """Periodically evict expired entries until the cache is collected"""
+        while True:
+            time.sleep(SimpleCache.SWEEP_INTERVAL_SECONDS)
+            cache = cache_ref()
+            if cache is None:
+                return
+            cache._sweep_expired()
+            del cache
+
+    def _sweep_expired(self) -> None:
+        """Evict expired entries, one shard lock at a time"""
+        for lock, cache in self._shards:
+            now = time.monotonic()
+            with lock:
+                expired_keys = [
+                    key for key, (_, expires_at) in cache.items()
+                    if now >= expires_at
+                ]
+                for key in expired_keys:
+                    del cache[key]
 
     def get(self, key: str) -> Optional[Any]:
         """
@@ -54,16 +93,19 @@ class SimpleCache:
         Returns:
             Cached value or None if not found or expired
         """
-        with self._lock:
-            entry = self._cache.get(key)
+        lock, cache = self._shard(key)
+        with lock:
+            entry = cache.get(key)
             if entry is None:
                 return None
 
-            if entry.is_expired():
-                del self._cache[key]
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del cache[key]
                 return None
 
-            return entry.value
+            cache.move_to_end(key)
+            return value
 
     def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
         """
@@ -75,8 +117,15 @@ class SimpleCache:
             ttl_seconds: Time-to-live in seconds (uses default if None)
         """
         ttl = ttl_seconds if ttl_seconds is not None else self.default_ttl
-        with self._lock:
-            self._cache[key] = CacheEntry(value, ttl)
+        entry = (value, time.monotonic() + ttl)
+        lock, cache = self._shard(key)
+        with lock:
+            if key in cache:
+                cache.move_to_end(key)
+            elif len(cache) >= self._shard_maxsize:
+                # Evict least recently used
+                cache.popitem(last=False)
+            cache[key] = entry
 
     def delete(self, key: str) -> None:
         """
@@ -85,13 +134,15 @@ class SimpleCache:
         Args:
             key: Cache key
         """
-        with self._lock:
-            self._cache.pop(key, None)
+        lock, cache = self._shard(key)
+        with lock:
+            cache.pop(key, None)
 
     def clear(self) -> None:
         """Clear all cache entries"""
-        with self._lock:
-            self._cache.clear()
+        for lock, cache in self._shards:
+            with lock:
+                cache.clear()
 
     def get_or_set(
         self,
@@ -122,19 +173,212 @@ class SimpleCache:
         return value
 
     def size(self) -> int:
-        """Get number of cache entries"""
-        with self._lock:
-            # Clean expired entries
-            expired_keys = [
-                key for key, entry in self._cache.items()
-                if entry.is_expired()
-            ]
-            for key in expired_keys:
-                del self._cache[key]
-            return len(self._cache)
+        """Get number of cache entries (may include not-yet-swept expired ones)"""
+        total = 0
+        for lock, cache in self._shards:
+            with lock:
+                total += len(cache)
+        return total
+
+
+class RedisCache:
+    """
+    Redis-backed cache with a per-process SimpleCache (L1) in front.
+
+    Exposes the same API as SimpleCache. Deletes are published on a pub/sub
+    channel so every worker drops its L1 copy; a background thread listens
+    for these invalidations. Redis errors degrade to L1-only behaviour.
+    Values are serialized with orjson.
+    """
+
+    # Invalidation message telling every worker to drop its whole L1
+    CLEAR_ALL_MESSAGE = "*"
+    CLEAR_BATCH_SIZE = 500
+
+    def __init__(
+        self,
+        redis_client: Any,
+        channel: str,
+        default_ttl_seconds: int = 300,
+        l1_ttl_seconds: int = 60,
+        key_prefix: Optional[str] = None
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            redis_client: Connected redis.Redis instance
+            channel: Pub/sub channel used for invalidation messages
+            default_ttl_seconds: Default Redis time-to-live in seconds
+            l1_ttl_seconds: Time-to-live of the in-process copy in seconds
+            key_prefix: Prefix shared by this cache's keys, lets clear() remove
+                them from Redis
+        """
+        self._redis = redis_client
+        self._channel = channel
+        self._key_prefix = key_prefix
+        self._l1 = SimpleCache(default_ttl_seconds=l1_ttl_seconds)
+        self.default_ttl = default_ttl_seconds
+
+        self._subscriber = threading.Thread(
+            target=self._listen_for_invalidations,
+            name=f"cache-invalidate-{channel}",
+            daemon=True
+        )
+        self._subscriber.start()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get value from cache.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None if not found or expired
+        """
+        value = self._l1.get(key)
+        if value is not None:
+            return value
+
+        try:
+            raw = self._redis.get(key)
+        except Exception as e:
+            logger.warning(f"Redis get failed for {key}: {e}")
+            return None
+
+        if raw is None:
+            return None
+
+        value = orjson.loads(raw)
+        self._l1.set(key, value)
+        return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
+        """
+        Set value in cache.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value to cache
+            ttl_seconds: Time-to-live in seconds (uses default if None)
+        """
+        ttl = ttl_seconds if ttl_seconds is not None else self.default_ttl
+        self._l1.set(key, value, min(ttl, self._l1.default_ttl))
+        try:
+            self._redis.setex(key, ttl, orjson.dumps(value))
+        except Exception as e:
+            logger.warning(f"Redis set failed for {key}: {e}")
+
+    def delete(self, key: str) -> None:
+        """
+        Delete value from cache and invalidate it in every worker.
+
+        Args:
+            key: Cache key
+        """
+        self._l1.delete(key)
+        try:
+            self._redis.delete(key)
+            self._redis.publish(self._channel, key)
+        except Exception as e:
+            logger.warning(f"Redis delete failed for {key}: {e}")
+
+    def clear(self) -> None:
+        """
+        Clear all cache entries in every worker.
+
+        Redis entries are only removed when a key_prefix is configured;
+        otherwise they expire by TTL.
+        """
+        self._l1.clear()
+        try:
+            if self._key_prefix:
+                batch = []
+                for key in self._redis.scan_iter(
+                        match=f"{self._key_prefix}*", count=self.CLEAR_BATCH_SIZE):
+                    batch.append(key)
+                    if len(batch) >= self.CLEAR_BATCH_SIZE:
+                        self._redis.delete(*batch)
+                        batch = []
+                if batch:
+                    self._redis.delete(*batch)
+            self._redis.publish(self._channel, self.CLEAR_ALL_MESSAGE)
+        except Exception as e:
+            logger.warning(f"Redis clear failed for {self._channel}: {e}")
+
+    def get_or_set(
+        self,
+        key: str,
+        fetch_fn: Callable[[], Any],
+        ttl_seconds: Optional[int] = None
+    ) -> Any:
+        """
+        Get value from cache or fetch and cache it if not present.
+
+        Args:
+            key: Cache key
+            fetch_fn: Function to fetch value if not in cache
+            ttl_seconds: Time-to-live in seconds (uses default if None)
+
+        Returns:
+            Cached or freshly fetched value
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        value = fetch_fn()
+        if value is not None:
+            self.set(key, value, ttl_seconds)
+
+        return value
+
+    def size(self) -> int:
+        """Get number of in-process cache entries"""
+        return self._l1.size()
+
+    def _listen_for_invalidations(self) -> None:
+        """Drop L1 entries named in invalidation messages (reconnects on error)."""
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._channel)
+                while True:
+                    # Poll below the client's socket timeout so an idle
+                    # channel is not mistaken for a dead connection
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is None:
+                        continue
+                    key = message.get("data")
+                    if isinstance(key, bytes):
+                        key = key.decode("utf-8")
+                    if key == self.CLEAR_ALL_MESSAGE:
+                        self._l1.clear()
+                    elif key:
+                        self._l1.delete(key)
+            except Exception as e:
+                logger.warning(
+                    f"Cache invalidation listener error on {self._channel}: {e}")
+                # Entries may have been missed while disconnected
+                self._l1.clear()
+                time.sleep(1)
+
+
+def _create_user_profile_cache():
+    """Use Redis for user profiles when configured, else an in-process cache."""
+    redis_client = get_redis_client()
+    if redis_client is None:
+        return SimpleCache(default_ttl_seconds=300, maxsize=10_000)
+    return RedisCache(
+        redis_client,
+        channel="user_profile_invalidate",
+        default_ttl_seconds=300,
+        key_prefix="user_profile:"
+    )
 
 
 # Global cache instances
-user_profile_cache = SimpleCache(default_ttl_seconds=300)  # 5 minutes TTL
+user_profile_cache = _create_user_profile_cache()  # 5 minutes TTL
 
 
@@ -0,0 +1,12 @@
+-- Add content_hash column to user_documents table
+-- SHA-256 of the uploaded file, used to skip re-uploading and re-indexing duplicates
+ALTER TABLE user_documents
+ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+-- One document per content per user (existing rows without a hash are exempt)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_user_documents_user_content_hash
+    ON user_documents(user_id, content_hash)
+    WHERE content_hash IS NOT NULL;
+
+-- Add comment for documentation
+COMMENT ON COLUMN user_documents.content_hash IS 'SHA-256 hex digest of the original file, unique per user';
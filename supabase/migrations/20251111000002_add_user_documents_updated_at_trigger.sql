@@ -0,0 +1,7 @@
+-- Maintain user_documents.updated_at in the database
+-- Lets the backend drop updated_at from UPDATE payloads
+
+-- Trigger to auto-update updated_at (function defined with the users table)
+DROP TRIGGER IF EXISTS update_user_documents_updated_at ON user_documents;
+CREATE TRIGGER update_user_documents_updated_at BEFORE UPDATE ON user_documents
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
@@ -0,0 +1,24 @@
+-- Increment users.queries_used_this_month from query_usage inserts
+-- Replaces a separate increment RPC round-trip after each recorded batch
+
+-- Statement-level trigger: one UPDATE per insert statement, grouped by user
+CREATE OR REPLACE FUNCTION increment_query_count_on_usage_insert()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE users
+    SET queries_used_this_month = users.queries_used_this_month + inserted.queries
+    FROM (
+        SELECT user_id, COUNT(*)::INTEGER AS queries
+        FROM new_rows
+        GROUP BY user_id
+    ) AS inserted
+    WHERE users.id = inserted.user_id;
+    RETURN NULL;
+END;
+$$ language 'plpgsql' SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS increment_query_count_after_usage_insert ON query_usage;
+CREATE TRIGGER increment_query_count_after_usage_insert
+    AFTER INSERT ON query_usage
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION increment_query_count_on_usage_insert();
@@ -0,0 +1,41 @@
+-- Usage statistics for many users in one call
+-- Same aggregation as get_user_usage_stats, grouped by user; users without
+-- queries in the period get a zero row
+
+CREATE OR REPLACE FUNCTION get_user_usage_stats_bulk(
+    user_ids UUID[],
+    days_param INTEGER DEFAULT 30
+)
+RETURNS TABLE(
+    user_id UUID,
+    total_queries BIGINT,
+    successful_queries BIGINT,
+    failed_queries BIGINT,
+    total_cost_usd NUMERIC,
+    total_tokens BIGINT,
+    average_cost_per_query NUMERIC
+) AS $$
+DECLARE
+    cutoff_date TIMESTAMP WITH TIME ZONE;
+BEGIN
+    cutoff_date := NOW() - (days_param || ' days')::INTERVAL;
+
+    RETURN QUERY
+    SELECT
+        ids.id as user_id,
+        COUNT(q.id)::BIGINT as total_queries,
+        COUNT(q.id) FILTER (WHERE q.success = true)::BIGINT as successful_queries,
+        COUNT(q.id) FILTER (WHERE q.success = false)::BIGINT as failed_queries,
+        COALESCE(SUM(q.cost_usd), 0)::NUMERIC as total_cost_usd,
+        COALESCE(SUM(q.tokens_used), 0)::BIGINT as total_tokens,
+        CASE
+            WHEN COUNT(q.id) > 0 THEN COALESCE(SUM(q.cost_usd), 0) / COUNT(q.id)::NUMERIC
+            ELSE 0::NUMERIC
+        END as average_cost_per_query
+    FROM unnest(user_ids) AS ids(id)
+    LEFT JOIN query_usage q
+        ON q.user_id = ids.id
+       AND q.created_at >= cutoff_date
+    GROUP BY ids.id;
+END;
+$$ language 'plpgsql' SECURITY DEFINER;
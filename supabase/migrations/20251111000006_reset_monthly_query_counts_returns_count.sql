@@ -0,0 +1,18 @@
+-- Return the number of users reset by reset_monthly_query_counts
+-- UsageTracker.reset_monthly_usage_all calls it as the one monthly reset
+
+DROP FUNCTION IF EXISTS reset_monthly_query_counts();
+
+CREATE OR REPLACE FUNCTION reset_monthly_query_counts()
+RETURNS INTEGER AS $$
+DECLARE
+    reset_count INTEGER;
+BEGIN
+    UPDATE users
+    SET queries_used_this_month = 0,
+        last_query_reset = NOW()
+    WHERE last_query_reset < DATE_TRUNC('month', NOW());
+    GET DIAGNOSTICS reset_count = ROW_COUNT;
+    RETURN reset_count;
+END;
+$$ language 'plpgsql';
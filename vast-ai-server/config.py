@@ -1,5 +1,6 @@
 """Configuration management for Vast.ai GPU server."""
 import os
+import tempfile
 from typing import Optional
 
 # Supabase Configuration
@@ -19,12 +20,21 @@ API_KEY: Optional[str] = os.getenv("API_KEY")
 
 # Queue Configuration
 REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
+REDIS_POOL_MAX: int = int(os.getenv("REDIS_POOL_MAX", "64"))
 MAX_CONCURRENT_WORKERS: int = int(os.getenv("MAX_CONCURRENT_WORKERS", "2"))
+# How long an idle worker blocks waiting for a task before polling again
+QUEUE_BLOCK_SECONDS: int = int(os.getenv("QUEUE_BLOCK_SECONDS", "5"))
 WEBHOOK_URL: Optional[str] = os.getenv("WEBHOOK_URL")
+# Uploaded PDFs wait here until a worker picks up their task
+UPLOAD_SPOOL_DIR: str = os.getenv(
+    "UPLOAD_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "mineru_uploads"))
 
 # Indexing Configuration
 VOYAGE_API_KEY: Optional[str] = os.getenv("VOYAGE_API_KEY")
 VOYAGE_MODEL: str = os.getenv("VOYAGE_EMBEDDING_MODEL", "voyage-large-2")
 QDRANT_URL: Optional[str] = os.getenv("QDRANT_URL")
 QDRANT_API_KEY: Optional[str] = os.getenv("QDRANT_API_KEY")
+# Upsert over gRPC (port 6334) instead of HTTP/JSON
+QDRANT_PREFER_GRPC: bool = os.getenv(
+    "QDRANT_PREFER_GRPC", "true").lower() in ("1", "true", "yes")
 COLLECTION_NAME: str = "document_chunks"
@@ -1,10 +1,216 @@
 """Qdrant indexing operations."""
+import asyncio
+import hashlib
 import logging
+import threading
 import uuid
+from array import array
 from typing import List, Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+EMBEDDING_BATCH_SIZE = 64  # Texts per Voyage request (API max is 128)
+EMBEDDING_CONCURRENCY = 8  # Voyage requests in flight per document
+
+# Embeddings cached in Redis across documents (boilerplate repeats between filings)
+EMBEDDING_CACHE_PREFIX = "emb:"
+EMBEDDING_CACHE_TTL_SECONDS = 30 * 24 * 3600
+
+# Namespace for point IDs derived from chunk IDs (never change: IDs would shift)
+POINT_ID_NAMESPACE = uuid.UUID('00000000-0000-0000-0000-000000000001')
+
+# Reused across documents (keeps HTTP connections alive)
+_voyage_client = None
+_voyage_client_key: Optional[str] = None
+_qdrant_client = None
+_qdrant_client_key: Optional[tuple] = None
+_embedding_cache = None
+_embedding_cache_url: Optional[str] = None
+_client_lock = threading.Lock()
+
+
+def _get_voyage_client(api_key: str):
+    """Get the shared async Voyage client (created on first use)."""
+    global _voyage_client, _voyage_client_key
+    with _client_lock:
+        if _voyage_client is None or _voyage_client_key != api_key:
+            import voyageai
+            _voyage_client = voyageai.AsyncClient(api_key=api_key)
+            _voyage_client_key = api_key
+        return _voyage_client
+
+
+def _get_qdrant_client(url: str, api_key: Optional[str], prefer_grpc: bool = True):
+    """Get the shared async Qdrant client (created on first use).
+
+    gRPC sends vectors as packed binary floats instead of JSON decimal text.
+    """
+    global _qdrant_client, _qdrant_client_key
+    key = (url, api_key, prefer_grpc)
+    with _client_lock:
+        if _qdrant_client is None or _qdrant_client_key != key:
+            from qdrant_client import AsyncQdrantClient
+            _qdrant_client = AsyncQdrantClient(
+                url=url, api_key=api_key, prefer_grpc=prefer_grpc)
+            _qdrant_client_key = key
+        return _qdrant_client
+
+
+def _get_embedding_cache(redis_url: str):
+    """Get the shared async Redis client for the embedding cache (created on first use)."""
+    global _embedding_cache, _embedding_cache_url
+    with _client_lock:
+        if _embedding_cache is None or _embedding_cache_url != redis_url:
+            import redis.asyncio as redis_asyncio
+            _embedding_cache = redis_asyncio.from_url(redis_url)
+            _embedding_cache_url = redis_url
+        return _embedding_cache
+
+
+def _embedding_cache_key(model: str, text: str) -> str:
+    """Cache key for a text's embedding under a given model."""
+    digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+    return f"{EMBEDDING_CACHE_PREFIX}{model}:{digest}"
+
+
+async def _get_cached_embeddings(
+    cache, model: str, texts: List[str]
+) -> Dict[str, List[float]]:
+    """Look up cached embeddings; returns {text: vector} for the hits."""
+    keys = [_embedding_cache_key(model, text) for text in texts]
+    values = await cache.mget(keys)
+    return {
+        text: array('f', value).tolist()
+        for text, value in zip(texts, values)
+        if value is not None
+    }
+
+
+async def _cache_embeddings(
+    cache, model: str, texts: List[str], embeddings: List[List[float]]
+):
+    """Store embeddings (as packed float32) with a TTL."""
+    async with cache.pipeline(transaction=False) as pipe:
+        for text, embedding in zip(texts, embeddings):
+            pipe.set(
+                _embedding_cache_key(model, text),
+                array('f', embedding).tobytes(),
+                ex=EMBEDDING_CACHE_TTL_SECONDS
+            )
+        await pipe.execute()
+
+
+def _find_chunk_starts(page_idx, text_level, text_len, max_size, starts) -> int:
+    """
+    Find where chunks start in a sequence of (non-empty) elements.
+
+    A new chunk starts on a page change, on a heading (text_level <= 2), or
+    when adding the element would push the space-joined text past max_size.
+    Writes start indices into the preallocated starts buffer and returns
+    how many were written. Plain loops over numbers so Numba can compile it.
+    """
+    n = len(text_len)
+    if n == 0:
+        return 0
+
+    starts[0] = 0
+    count = 1
+    current_page = page_idx[0]
+    current_len = text_len[0]
+    for i in range(1, n):
+        should_start_new = False
+        if page_idx[i] != current_page:
+            should_start_new = True
+            current_page = page_idx[i]
+        if text_level[i] <= 2:
+            should_start_new = True
+        if not should_start_new and current_len + text_len[i] > max_size:
+            should_start_new = True
+
+        if should_start_new:
+            starts[count] = i
+            count += 1
+            current_len = text_len[i]
+        else:
+            current_len += 1 + text_len[i]  # Join space
+    return count
+
+
+# Compile the boundary scan to native code (Numba is in requirements.txt;
+# the pure-Python scan remains the fallback if it is missing)
+try:
+    import numpy as np
+    from numba import njit
+    _find_chunk_starts_native = njit(_find_chunk_starts)
+except ImportError:
+    np = None
+    _find_chunk_starts_native = None
+
+
+def _chunk_starts(
+    page_idx: List[int],
+    text_level: List[int],
+    text_len: List[int],
+    max_size: int
+) -> List[int]:
+    """Chunk start indices (native scan when Numba is available)."""
+    if _find_chunk_starts_native is not None:
+        try:
+            starts = np.empty(len(text_len), dtype=np.int64)
+            count = _find_chunk_starts_native(
+                np.asarray(page_idx, dtype=np.int64),
+                np.asarray(text_level, dtype=np.int64),
+                np.asarray(text_len, dtype=np.int64),
+                max_size,
+                starts
+            )
+            return starts[:count].tolist()
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Native chunk scan unavailable, using Python: {e}")
+
+    starts = [0] * len(text_len)
+    count = _find_chunk_starts(page_idx, text_level, text_len, max_size, starts)
+    return starts[:count]
+
+
+# Chunk payload field -> document metadata field (same for every chunk)
+_METADATA_FIELD_MAP = (
+    # Core metadata (use standard field names from metadata schema)
+    ('fiscal_year', 'fiscal_year'),
+    ('fiscal_quarter', 'fiscal_quarter'),
+    ('document_type', 'document_type'),
+    ('document_category', 'document_category'),
+    ('fiscal_period_end', 'fiscal_period_end'),
+    ('period_type', 'period_type'),
+    # Company info
+    ('company_ticker', 'company_ticker'),
+    ('company_sector', 'company_sector'),
+    ('company_industry', 'company_industry'),
+    ('company_country', 'company_country'),
+    ('company_exchange', 'company_exchange'),
+    # Content flags
+    ('has_financial_statements', 'has_financial_statements'),
+    ('has_mda', 'has_mda'),
+    ('has_risk_factors', 'has_risk_factors'),
+    ('has_compensation', 'has_compensation'),
+    ('has_governance', 'has_governance'),
+    # Other
+    ('filename', 'filename'),
+    ('reporting_standard', 'reporting_standard'),
+    ('currency', 'currency'),
+)
+
+
+def _project_metadata(metadata: Dict[str, Any], document_id: str) -> Dict[str, Any]:
+    """Build the document-level part of chunk metadata once per document."""
+    base_metadata = {
+        'company': metadata.get('company_name') or metadata.get('company'),
+        'file_source': f"{document_id}_content_list.json",
+    }
+    for field, source in _METADATA_FIELD_MAP:
+        base_metadata[field] = metadata.get(source)
+    return base_metadata
+
 
 class Chunker:
     """Chunker for content_list elements with semantic boundaries."""
@@ -18,106 +224,68 @@ class Chunker:
         document_id: str,
         metadata: Dict[str, Any] = None
     ) -> List[Dict[str, Any]]:
-        """Chunk content_list elements into semantic chunks."""
+        """Chunk content_list elements into semantic chunks (never empty ones)."""
         if not elements:
             return []
 
-        chunks = []
-        current_chunk = []
-        current_page = None
-        chunk_id = 0
-        metadata = metadata or {}
+        base_metadata = _project_metadata(metadata or {}, document_id)
 
-        for i, elem in enumerate(elements):
-            page_idx = elem.get('page_idx', 0)
+        # Extract text and normalized type once per element, dropping
+        # elements without text
+        kept_elements = []
+        texts = []
+        elem_types = []
+        for elem in elements:
             elem_type = elem.get('type', '').lower()
+            text = self._extract_text_from_element(elem, elem_type)
+            if text:
+                kept_elements.append(elem)
+                texts.append(text)
+                elem_types.append(elem_type)
+
+        # Boundary scan over parallel (SoA) columns
+        starts = _chunk_starts(
+            [elem.get('page_idx', 0) for elem in kept_elements],
+            [elem.get('text_level', 999) for elem in kept_elements],
+            [len(text) for text in texts],
+            self.MAX_CHUNK_SIZE
+        )
 
-            # Extract text based on element type
-            text = self._extract_text_from_element(elem)
-
-            if not text:
-                continue
-
-            # Start new chunk if new page or heading
-            should_start_new = False
-            if current_page is None:
-                current_page = page_idx
-            elif page_idx != current_page:
-                should_start_new = True
-                current_page = page_idx
-
-            # Start new chunk on headings (text_level <= 2)
-            text_level = elem.get('text_level', 999)
-            if text_level <= 2 and current_chunk:
-                should_start_new = True
-
-            # Check chunk size limit (only if not already starting new chunk)
-            if not should_start_new and current_chunk:
-                # Calculate current chunk size using helper method
-                current_chunk_text = ' '.join(
-                    self._extract_text_from_element(e)
-                    for e in current_chunk
-                )
-                # If adding this element would exceed limit, start new chunk
-                if len(current_chunk_text) + len(text) > self.MAX_CHUNK_SIZE:
-                    should_start_new = True
-
-            if should_start_new and current_chunk:
-                chunk = self._create_chunk(
-                    current_chunk, chunk_id, user_id, document_id, metadata
-                )
-                chunks.append(chunk)
-                chunk_id += 1
-                current_chunk = []
-
-            current_chunk.append(elem)
-
-        # Finalize last chunk
-        if current_chunk:
-            chunk = self._create_chunk(
-                current_chunk, chunk_id, user_id, document_id, metadata
-            )
-            chunks.append(chunk)
+        # Build chunk dicts only at boundaries
+        bounds = starts + [len(kept_elements)]
+        chunks = []
+        for chunk_id in range(len(starts)):
+            start, end = bounds[chunk_id], bounds[chunk_id + 1]
+            chunks.append(self._create_chunk(
+                kept_elements[start:end], texts[start:end], elem_types[start:end],
+                chunk_id, user_id, document_id, base_metadata
+            ))
 
         logger.info(
             f"Created {len(chunks)} chunks from {len(elements)} elements")
         return chunks
 
-    def _extract_text_from_element(self, elem: Dict[str, Any]) -> str:
+    def _extract_text_from_element(
+        self,
+        elem: Dict[str, Any],
+        elem_type: Optional[str] = None
+    ) -> str:
         """Extract text from element, handling VLM-specific block types."""
-        elem_type = elem.get('type', '').lower()
-
-        # Code blocks may have nested structure (code_body, code_caption)
-        if elem_type == 'code':
-            # Check for nested blocks structure
-            blocks = elem.get('blocks', [])
-            if blocks:
-                # Extract text from nested blocks (code_body, code_caption)
-                texts = []
-                for block in blocks:
-                    block_text = block.get('text', '').strip()
-                    if block_text:
-                        texts.append(block_text)
-                if texts:
-                    return '\n'.join(texts)
-            # Fallback to direct text field
-            return elem.get('text', '').strip() or elem.get('content', '').strip()
+        if elem_type is None:
+            elem_type = elem.get('type', '').lower()
 
-        # List blocks may have nested items
-        elif elem_type == 'list':
-            # Check for nested blocks structure
-            blocks = elem.get('blocks', [])
+        # Code and list blocks may have nested structure
+        # (code_body/code_caption, list items)
+        if elem_type in ('code', 'list'):
+            blocks = elem.get('blocks')
             if blocks:
-                # Extract text from nested list items
-                texts = []
-                for block in blocks:
-                    block_text = block.get('text', '').strip()
-                    if block_text:
-                        texts.append(block_text)
+                texts = [
+                    block_text
+                    for block_text in (block.get('text', '').strip() for block in blocks)
+                    if block_text
+                ]
                 if texts:
                     return '\n'.join(texts)
-            # Fallback to direct text field
-            return elem.get('text', '').strip() or elem.get('content', '').strip()
 
         # Standard text extraction (MinerU uses 'text' field, not 'content')
         return elem.get('text', '').strip() or elem.get('content', '').strip()
@@ -125,31 +293,28 @@ class Chunker:
     def _create_chunk(
         self,
         elements: List[Dict[str, Any]],
+        texts: List[str],
+        elem_types: List[str],
         chunk_id: int,
         user_id: str,
         document_id: str,
-        metadata: Dict[str, Any]
+        base_metadata: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Create a chunk dict from elements."""
-        # Extract text using helper method (handles code/list blocks)
-        texts = []
-        for elem in elements:
-            text = self._extract_text_from_element(elem)
-            if text:
-                texts.append(text)
+        """Create a chunk dict from elements and their already-extracted texts and types."""
         content = ' '.join(texts)
 
         first_elem = elements[0]
+
+        # The boundary scan starts a new chunk on every page change, so all
+        # elements of a chunk share the first element's page
         page_idx = first_elem.get('page_idx', 0)
-        page_indices = sorted(set(e.get('page_idx', 0) for e in elements))
+        page_indices = [page_idx]
 
         # Detect chunk type (VLM-specific block types)
-        has_table = any(elem.get('type', '').lower() ==
-                        'table' for elem in elements)
-        has_code = any(elem.get('type', '').lower()
-                       == 'code' for elem in elements)
-        has_list = any(elem.get('type', '').lower()
-                       == 'list' for elem in elements)
+        type_set = set(elem_types)
+        has_table = 'table' in type_set
+        has_code = 'code' in type_set
+        has_list = 'list' in type_set
         text_level = first_elem.get('text_level', 999)
 
         # Priority: heading > table > code > list > paragraph
@@ -175,42 +340,19 @@ class Chunker:
             'metadata': {
                 'user_id': user_id,
                 'document_id': document_id,
-                'page_idx': page_indices[0] if page_indices else 0,
+                'page_idx': page_idx,
                 'chunk_type': chunk_type,
                 'has_table': has_table,
-                # Core metadata (use standard field names from metadata schema)
-                'company': metadata.get('company_name') or metadata.get('company'),
-                'fiscal_year': metadata.get('fiscal_year'),
-                'fiscal_quarter': metadata.get('fiscal_quarter'),
-                'document_type': metadata.get('document_type'),
-                'document_category': metadata.get('document_category'),
-                'fiscal_period_end': metadata.get('fiscal_period_end'),
-                'period_type': metadata.get('period_type'),
-                # Company info
-                'company_ticker': metadata.get('company_ticker'),
-                'company_sector': metadata.get('company_sector'),
-                'company_industry': metadata.get('company_industry'),
-                'company_country': metadata.get('company_country'),
-                'company_exchange': metadata.get('company_exchange'),
-                # Content flags
-                'has_financial_statements': metadata.get('has_financial_statements'),
-                'has_mda': metadata.get('has_mda'),
-                'has_risk_factors': metadata.get('has_risk_factors'),
-                'has_compensation': metadata.get('has_compensation'),
-                'has_governance': metadata.get('has_governance'),
-                # Other
-                'filename': metadata.get('filename'),
-                'file_source': f"{document_id}_content_list.json",
-                'reporting_standard': metadata.get('reporting_standard'),
-                'currency': metadata.get('currency'),
+                **base_metadata,
             }
         }
 
 
 def chunk_to_point(chunk: Dict[str, Any]) -> Dict[str, Any]:
     """Convert chunk dict to Qdrant point format."""
-    # Generate UUID for point ID (Qdrant requires UUID or integer)
-    point_id = str(uuid.uuid4())
+    # Deterministic UUID for point ID (Qdrant requires UUID or integer),
+    # so re-indexing a document overwrites its points instead of duplicating
+    point_id = str(uuid.uuid5(POINT_ID_NAMESPACE, chunk['chunk_id']))
 
     return {
         'id': point_id,
@@ -229,7 +371,7 @@ def chunk_to_point(chunk: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def index_document(
+async def index_document(
     user_id: str,
     document_id: str,
     content_list: List[Dict[str, Any]],
@@ -238,80 +380,149 @@ def index_document(
     voyage_model: str,
     qdrant_url: str,
     qdrant_api_key: str,
-    collection_name: str
+    collection_name: str,
+    qdrant_prefer_grpc: bool = True,
+    embedding_cache_url: Optional[str] = None
 ) -> int:
-    """Index document content into Qdrant."""
+    """
+    Index document content into Qdrant (async Voyage and Qdrant clients).
+
+    With embedding_cache_url set, embeddings are looked up in (and saved to)
+    Redis first, so text seen in earlier documents is not embedded again.
+    """
     try:
-        import voyageai
-        from qdrant_client import QdrantClient
-        from qdrant_client.models import PointStruct
+        from qdrant_client.models import (
+            Batch, FieldCondition, Filter, FilterSelector, MatchValue
+        )
 
         logger.info(f"Indexing document {document_id} for user {user_id}")
 
-        # Chunk elements
+        # Chunk elements (CPU-bound, keep it off the event loop)
         chunker = Chunker()
-        chunks = chunker.chunk_elements(
+        chunks = await asyncio.to_thread(
+            chunker.chunk_elements,
             elements=content_list,
             user_id=user_id,
             document_id=document_id,
             metadata=metadata or {}
         )
 
-        # Filter empty chunks
-        valid_chunks = [chunk for chunk in chunks if chunk.get(
-            'content', '').strip()]
-
-        if not valid_chunks:
+        # Elements without text are dropped while chunking, so every chunk
+        # has content
+        if not chunks:
             logger.warning(f"No valid chunks for document {document_id}")
             return 0
 
-        logger.info(f"Generated {len(valid_chunks)} valid chunks")
-
-        # Generate embeddings in batches
-        voyage_client = voyageai.Client(api_key=voyage_api_key)
-        embedded_chunks = []
-        batch_size = 10
-
-        for i in range(0, len(valid_chunks), batch_size):
-            batch = valid_chunks[i:i + batch_size]
-            texts = [chunk['content'] for chunk in batch]
-
-            result = voyage_client.embed(
-                texts,
-                model=voyage_model,
-                input_type="document"
-            )
-
-            for j, chunk in enumerate(batch):
-                chunk['embedding'] = result.embeddings[j]
-                embedded_chunks.append(chunk)
-
-            logger.debug(
-                f"Embedded batch {i // batch_size + 1}/{(len(valid_chunks) + batch_size - 1) // batch_size}")
+        logger.info(f"Generated {len(chunks)} valid chunks")
 
-        logger.info(f"Generated embeddings for {len(embedded_chunks)} chunks")
+        # Embed each distinct text once (headers, footers and disclaimers
+        # repeat across chunks); chunks with the same content share a vector
+        chunks_by_text: Dict[str, List[Dict[str, Any]]] = {}
+        for chunk in chunks:
+            chunks_by_text.setdefault(chunk['content'], []).append(chunk)
+        unique_texts = list(chunks_by_text)
 
-        # Convert to Qdrant points
-        points = []
-        for chunk in embedded_chunks:
+        # Reuse embeddings from earlier documents (cache errors never fail indexing)
+        cache = None
+        cached_embeddings: Dict[str, List[float]] = {}
+        if embedding_cache_url:
             try:
-                point_dict = chunk_to_point(chunk)
-                point = PointStruct(**point_dict)
-                points.append(point)
+                cache = _get_embedding_cache(embedding_cache_url)
+                cached_embeddings = await _get_cached_embeddings(
+                    cache, voyage_model, unique_texts)
             except Exception as e:
+                logger.warning(f"Embedding cache unavailable: {e}")
+                cache = None
+        texts_to_embed = [
+            text for text in unique_texts if text not in cached_embeddings]
+
+        # Embed and upsert batch by batch, several batches in flight at once:
+        # each batch is upserted as soon as its embeddings return
+        voyage_client = _get_voyage_client(voyage_api_key)
+        qdrant_client = _get_qdrant_client(
+            qdrant_url, qdrant_api_key, qdrant_prefer_grpc)
+        semaphore = asyncio.Semaphore(EMBEDDING_CONCURRENCY)
+
+        async def upsert(texts: List[str], embeddings: List[List[float]]) -> int:
+            # Convert to a columnar Qdrant batch (no per-point model)
+            ids, vectors, payloads = [], [], []
+            for text, embedding in zip(texts, embeddings):
+                for chunk in chunks_by_text[text]:
+                    chunk['embedding'] = embedding
+                    try:
+                        point = chunk_to_point(chunk)
+                    except Exception as e:
+                        logger.error(
+                            f"Error converting chunk {chunk.get('chunk_id')}: {e}")
+                        continue
+                    ids.append(point['id'])
+                    vectors.append(point['vector'])
+                    payloads.append(point['payload'])
+
+            # Don't wait for Qdrant to apply the batch (acknowledged on receipt)
+            if ids:
+                await qdrant_client.upsert(
+                    collection_name=collection_name,
+                    points=Batch(ids=ids, vectors=vectors, payloads=payloads),
+                    wait=False
+                )
+            return len(ids)
+
+        async def embed_and_upsert(texts: List[str]) -> int:
+            async with semaphore:
+                result = await voyage_client.embed(
+                    texts,
+                    model=voyage_model,
+                    input_type="document"
+                )
+                if cache is not None:
+                    try:
+                        await _cache_embeddings(
+                            cache, voyage_model, texts, result.embeddings)
+                    except Exception as e:
+                        logger.warning(f"Failed to cache embeddings: {e}")
+                return await upsert(texts, result.embeddings)
+
+        async def upsert_cached(texts: List[str]) -> int:
+            async with semaphore:
+                return await upsert(
+                    texts, [cached_embeddings[text] for text in texts])
+
+        cached_texts = list(cached_embeddings)
+        indexed_counts = await asyncio.gather(
+            *(embed_and_upsert(texts_to_embed[i:i + EMBEDDING_BATCH_SIZE])
+              for i in range(0, len(texts_to_embed), EMBEDDING_BATCH_SIZE)),
+            *(upsert_cached(cached_texts[i:i + EMBEDDING_BATCH_SIZE])
+              for i in range(0, len(cached_texts), EMBEDDING_BATCH_SIZE)),
+            return_exceptions=True)
+
+        # All batches have settled; if any failed, remove what the others
+        # wrote so the document is never left partially indexed
+        errors = [r for r in indexed_counts if isinstance(r, BaseException)]
+        if errors:
+            for error in errors:
                 logger.error(
-                    f"Error converting chunk {chunk.get('chunk_id')}: {e}")
-                continue
-
-        # Upsert to Qdrant
-        qdrant_client = QdrantClient(url=qdrant_url, api_key=qdrant_api_key)
-        qdrant_client.upsert(
-            collection_name=collection_name,
-            points=points
-        )
-
-        logger.info(f"Indexed {len(points)} chunks for document {document_id}")
-        return len(points)
+                    f"Indexing batch failed for document {document_id}: {error}")
+            await qdrant_client.delete(
+                collection_name=collection_name,
+                points_selector=FilterSelector(filter=Filter(must=[
+                    FieldCondition(key="document_id",
+                                   match=MatchValue(value=document_id))
+                ])),
+                wait=True
+            )
+            logger.error(
+                f"Removed partially indexed points for document {document_id} "
+                f"({len(errors)} of {len(indexed_counts)} batches failed)")
+            return 0
+        indexed = sum(indexed_counts)
+
+        if len(texts_to_embed) < len(chunks):
+            logger.info(
+                f"Embedded {len(texts_to_embed)} distinct texts for {len(chunks)} chunks "
+                f"({len(cached_embeddings)} from cache)")
+        logger.info(f"Indexed {indexed} chunks for document {document_id}")
+        return indexed
 
     except Exception as e:
         logger.error(
@@ -2,11 +2,12 @@
 import os
 import logging
 import json
+import shutil
 from pathlib import Path
 from typing import List, Optional
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import uvicorn
@@ -33,6 +34,8 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+UPLOAD_COPY_CHUNK_SIZE = 1024 * 1024
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -51,7 +54,7 @@ async def lifespan(app: FastAPI):
         storage.init_supabase(config.SUPABASE_URL, config.SUPABASE_SECRET_KEY)
 
     # Initialize Redis
-    task_queue.init_redis(config.REDIS_URL)
+    task_queue.init_redis(config.REDIS_URL, config.REDIS_POOL_MAX)
     logger.info("Redis: {}".format("Connected" if task_queue.is_redis_configured(
     ) else "Not available (using in-memory)"))
 
@@ -133,15 +136,28 @@ async def health():
     }
 
 
+@app.get("/statuses")
+async def get_statuses(task_ids: List[str] = Query(...), include_result: bool = False):
+    """Get the status of several tasks at once (null for unknown IDs)."""
+    return task_queue.get_task_statuses(task_ids, include_result)
+
+
 @app.get("/status/{task_id}")
-async def get_status(task_id: str):
-    """Get task status by ID."""
-    status = task_queue.get_task_status(task_id)
+async def get_status(task_id: str, include_result: bool = True):
+    """Get task status by ID (pass include_result=false to skip the result)."""
+    status = task_queue.get_task_status(task_id, include_result)
     if not status:
         raise HTTPException(status_code=404, detail="Task not found")
     return status
 
 
+def _copy_upload(file: UploadFile, file_path: str) -> None:
+    """Copy an uploaded file to disk in 1MB chunks."""
+    file.file.seek(0)
+    with open(file_path, 'wb') as f:
+        shutil.copyfileobj(file.file, f, UPLOAD_COPY_CHUNK_SIZE)
+
+
 @app.post("/process", response_model=models.BatchProcessResponse)
 async def process_endpoint(
     request: Request,
@@ -200,34 +216,41 @@ async def process_endpoint(
     while len(metadatas_list) < len(files_list):
         metadatas_list.append(None)
 
-    # Enqueue all files
-    task_ids = []
-    for i, file in enumerate(files_list):
-        # Validate file
+    # Validate all files before spooling any of them
+    for file in files_list:
         if not file.filename or not file.filename.lower().endswith('.pdf'):
             raise HTTPException(
                 status_code=400, detail=f"File {file.filename} is not a PDF")
 
-        # Use document ID from Railway (not generated here)
-        document_id = document_ids_list[i]
-
-        # Read file content
-        file_content = await file.read()
-
-        # Create task
-        task_data = {
-            "user_id": user_id,
-            "document_id": document_id,
-            "filename": file.filename,
-            "file_data": file_content,
-            "metadata": metadatas_list[i] if i < len(metadatas_list) else None,
-            "upload_to_storage": upload_to_storage,
-            "index": index
-        }
-
-        # Enqueue task
-        task_id = task_queue.enqueue_task(task_data)
-        task_ids.append(task_id)
+    tasks = []
+    spooled_paths = []
+    try:
+        for i, file in enumerate(files_list):
+            # Use document ID from Railway (not generated here)
+            document_id = document_ids_list[i]
+
+            # Stream upload to the spool directory (never held in memory)
+            file_path = task_queue.spool_file_path(config.UPLOAD_SPOOL_DIR)
+            spooled_paths.append(file_path)
+            await asyncio.to_thread(_copy_upload, file, file_path)
+
+            tasks.append({
+                "user_id": user_id,
+                "document_id": document_id,
+                "filename": file.filename,
+                "file_path": file_path,
+                "metadata": metadatas_list[i] if i < len(metadatas_list) else None,
+                "upload_to_storage": upload_to_storage,
+                "index": index
+            })
+
+        # Enqueue all files (one Redis round trip)
+        task_ids = await task_queue.enqueue_tasks_async(tasks)
+    except Exception:
+        # Nothing was queued; don't leave the spooled uploads behind
+        for file_path in spooled_paths:
+            task_queue.discard_spooled_file({"file_path": file_path})
+        raise
 
     # Always return BatchProcessResponse format for consistency
     return models.BatchProcessResponse(
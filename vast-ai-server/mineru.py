@@ -1,22 +1,23 @@
 """MinerU PDF parsing operations."""
+import asyncio
 import os
-import json
 import logging
-import subprocess
 import time
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
 
-def parse_pdf(
+async def parse_pdf(
     pdf_path: Path,
     output_dir: Path,
     backend: str,
     timeout: int
 ) -> List[Dict[str, Any]]:
-    """Parse PDF using MinerU CLI with GPU backend."""
+    """Parse PDF using MinerU CLI with GPU backend (async subprocess)."""
     logger.info(f"Running MinerU on {pdf_path.name} with backend {backend}")
 
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -33,19 +34,25 @@ def parse_pdf(
 
     try:
         logger.info(f"Executing: {' '.join(cmd)}")
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            timeout=timeout,
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
             env=os.environ.copy()
         )
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise Exception(
+                f"MinerU parsing timed out after {timeout} seconds")
 
         # Log output
-        if result.stdout:
-            logger.info(f"MinerU output: {result.stdout[:1000]}")
-        logger.info(f"MinerU return code: {result.returncode}")
+        if stdout:
+            output = stdout.decode('utf-8', errors='replace')
+            logger.info(f"MinerU output: {output[:1000]}")
+        logger.info(f"MinerU return code: {proc.returncode}")
 
         # According to MinerU docs: outputs are in {output_path}/{filename}/ subdirectory
         # File pattern: {filename}_content_list.json
@@ -54,51 +61,35 @@ def parse_pdf(
         original_filename = pdf_path.stem  # filename without extension
 
         # Try multiple possible locations based on backend
-        possible_locations = [
-            # VLM backend locations
-            output_dir / original_filename /
-            f"{original_filename}_content_list.json",
-            output_dir / original_filename / "vlm" /
-            f"{original_filename}_content_list.json",
-            # Pipeline backend location
-            output_dir / original_filename / "auto" /
-            f"{original_filename}_content_list.json",
-            # Direct in output_dir (fallback)
-            output_dir / f"{original_filename}_content_list.json",
-        ]
+        possible_locations = _content_list_locations(
+            output_dir, original_filename)
 
         # Wait for files to be written (vLLM engine writes asynchronously after subprocess returns)
         # For larger files, wait longer. Base wait: 10s, add 1s per MB of PDF size
         pdf_size_mb = pdf_path.stat().st_size / (1024 * 1024)
         base_wait = 10
         max_wait = min(60, base_wait + int(pdf_size_mb))  # Cap at 60 seconds
-        max_retries = 6  # Check 6 times
-        retry_interval = max_wait / max_retries
+        poll_interval = 0.1
+        deadline = time.monotonic() + max_wait
 
+        # Poll only the known directories (one listing each, no tree walk)
         content_list_file = None
-        for attempt in range(max_retries):
-            # Check all possible locations
-            for location in possible_locations:
-                if location.exists():
-                    content_list_file = location
-                    break
-
-            # If still not found, search recursively
-            if not content_list_file:
-                for pattern in [f"**/{original_filename}_content_list.json", "**/content_list.json"]:
-                    matches = list(output_dir.rglob(pattern))
-                    if matches:
-                        content_list_file = matches[0]
-                        break
-
-            if content_list_file and content_list_file.exists():
+        logged_wait = False
+        while True:
+            content_list_file = _find_content_list(
+                output_dir, original_filename)
+            if content_list_file or time.monotonic() >= deadline:
                 break
-
-            # Wait before next attempt
-            if attempt < max_retries - 1:
+            if not logged_wait:
                 logger.info(
-                    f"Waiting for content_list.json (attempt {attempt + 1}/{max_retries}, PDF size: {pdf_size_mb:.1f}MB)...")
-                time.sleep(retry_interval)
+                    f"Waiting up to {max_wait}s for content_list.json (PDF size: {pdf_size_mb:.1f}MB)...")
+                logged_wait = True
+            await asyncio.sleep(poll_interval)
+
+        # Last resort: one recursive search for unexpected layouts
+        if not content_list_file:
+            content_list_file = await asyncio.to_thread(
+                _search_content_list, output_dir, original_filename)
 
         if not content_list_file or not content_list_file.exists():
             # Log directory structure for debugging
@@ -118,15 +109,70 @@ def parse_pdf(
         logger.info(f"Found content_list.json: {content_list_file}")
 
         # Load content list
-        with open(content_list_file, 'r', encoding='utf-8') as f:
-            content_list = json.load(f)
+        content_list = await asyncio.to_thread(_load_content_list, content_list_file)
 
         logger.info(
             f"Loaded {len(content_list)} elements from content_list.json")
         return content_list
 
-    except subprocess.TimeoutExpired:
-        raise Exception(f"MinerU parsing timed out after {timeout} seconds")
     except Exception as e:
         logger.error(f"MinerU parsing failed: {e}", exc_info=True)
         raise
+
+
+def _content_list_locations(output_dir: Path, original_filename: str) -> List[Path]:
+    """Known content_list.json locations, in lookup order."""
+    name = f"{original_filename}_content_list.json"
+    return [
+        # VLM backend locations
+        output_dir / original_filename / name,
+        output_dir / original_filename / "vlm" / name,
+        # Pipeline backend location
+        output_dir / original_filename / "auto" / name,
+        # Direct in output_dir (fallback)
+        output_dir / name,
+    ]
+
+
+def _list_dir(directory: Path) -> set:
+    """Names in directory (empty if it does not exist yet)."""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
+
+
+def _find_content_list(output_dir: Path, original_filename: str) -> Optional[Path]:
+    """
+    Look for content_list.json in the known locations.
+
+    Lists each candidate directory once and checks names against the listing;
+    the vlm/ and auto/ subdirectories are only listed if they exist.
+    """
+    name = f"{original_filename}_content_list.json"
+    filename_dir = output_dir / original_filename
+    listing = _list_dir(filename_dir)
+    if name in listing:
+        return filename_dir / name
+    for subdir in ("vlm", "auto"):
+        if subdir in listing and name in _list_dir(filename_dir / subdir):
+            return filename_dir / subdir / name
+    if name in _list_dir(output_dir):
+        return output_dir / name
+    return None
+
+
+def _search_content_list(output_dir: Path, original_filename: str) -> Optional[Path]:
+    """Recursively search output_dir for a content_list.json (runs in a worker thread)."""
+    for pattern in [f"**/{original_filename}_content_list.json", "**/content_list.json"]:
+        match = next(output_dir.rglob(pattern), None)
+        if match:
+            return match
+    return None
+
+
+def _load_content_list(content_list_file: Path) -> List[Dict[str, Any]]:
+    """Read and parse content_list.json (runs in a worker thread)."""
+    with open(content_list_file, 'rb') as f:
+        return orjson.loads(f.read())
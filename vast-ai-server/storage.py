@@ -1,8 +1,9 @@
 """Supabase storage operations."""
-import json
 import logging
 from typing import Optional, List, Dict, Any
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
 _supabase_client = None
@@ -34,9 +35,8 @@ def upload_content_list(
         return False
 
     try:
-        content_json = json.dumps(
-            content_list, indent=2, ensure_ascii=False
-        ).encode('utf-8')
+        # Compact UTF-8 JSON (no pretty-printing for a machine-read artifact)
+        content_json = orjson.dumps(content_list)
         storage = _supabase_client.storage.from_(bucket)
 
         try:
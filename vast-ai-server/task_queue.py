@@ -1,18 +1,32 @@
 """Redis queue management."""
-import json
+import base64
 import logging
+import os
+import tempfile
+import threading
+import time
 import uuid
-import base64
-import queue as stdlib_queue
-from typing import Optional, Dict, Any
+from collections import deque
+from typing import Optional, Dict, Any, List
 from datetime import datetime, timezone
 from enum import Enum
 
+import msgpack
+import orjson
+from cachetools import TTLCache
+
+try:
+    from . import config
+except ImportError:
+    # Allow running as script
+    import config
+
 logger = logging.getLogger(__name__)
 
-# In-memory fallback
-_processing_queue = None
-_task_status = {}
+# In-memory fallback: append/popleft on a deque are atomic, the condition
+# only wakes workers waiting on an empty queue
+_processing_queue = deque()
+_queue_not_empty = threading.Condition()
 
 
 class TaskStatus(str, Enum):
@@ -23,99 +37,399 @@ class TaskStatus(str, Enum):
     FAILED = "failed"
 
 
-def init_redis(redis_url: str) -> bool:
-    """Initialize Redis client."""
-    global _redis_client
+def init_redis(redis_url: str, max_connections: int = 64) -> bool:
+    """
+    Initialize Redis client.
+
+    Connections use TCP keepalive and are health-checked after 30s idle, so
+    links silently dropped by NAT/firewalls are replaced before use. No socket
+    read timeout is set: idle workers block in BRPOP for QUEUE_BLOCK_SECONDS.
+    """
+    global _redis_client, _async_redis_client, _dequeue_script, _claim_script
     try:
         import redis
-        _redis_client = redis.from_url(redis_url, decode_responses=True)
+        import redis.asyncio as redis_asyncio
+        # Bytes mode: queue entries are msgpack, status fields decoded on read
+        pool_options = dict(
+            max_connections=max_connections,
+            decode_responses=False,
+            socket_keepalive=True,
+            socket_connect_timeout=5,
+            health_check_interval=30,
+            retry_on_timeout=True
+        )
+        pool = redis.ConnectionPool.from_url(redis_url, **pool_options)
+        _redis_client = redis.Redis(connection_pool=pool)
         _redis_client.ping()
+        _dequeue_script = _redis_client.register_script(DEQUEUE_SCRIPT)
+        _claim_script = _redis_client.register_script(CLAIM_SCRIPT)
+        # Load the scripts up front so the first EVALSHA never misses
+        _redis_client.script_load(DEQUEUE_SCRIPT)
+        _redis_client.script_load(CLAIM_SCRIPT)
+        # Async client for enqueues from request handlers (no thread blocked per RTT)
+        _async_redis_client = redis_asyncio.Redis(
+            connection_pool=redis_asyncio.ConnectionPool.from_url(
+                redis_url, **pool_options))
         logger.info(f"Redis connected: {redis_url}")
         return True
     except ImportError:
         logger.warning("Redis not installed - using in-memory queue")
         _redis_client = None
+        _async_redis_client = None
         return False
     except Exception as e:
         logger.warning(f"Redis connection failed: {e} - using in-memory queue")
         _redis_client = None
+        _async_redis_client = None
         return False
 
 
 _redis_client = None
+_async_redis_client = None
+# Queued task envelopes are msgpack-encoded dicts
 QUEUE_KEY = "mineru:queue"
-STATUS_KEY_PREFIX = "mineru:status:"
+# Task status hashes: small "status"/"task_id"/"created_at"/"updated_at"
+# fields (keys named apart from the old JSON-string "mineru:status:" keys,
+# which simply expire). The task itself lives only in the queue, and the
+# result in a separate JSON string key so status polls don't fetch it.
+STATUS_KEY_PREFIX = "mineru:task:"
+RESULT_KEY_PREFIX = "mineru:result:"
+STATUS_TTL_SECONDS = 86400  # 24 hours
+# In-memory fallback statuses: bounded and expiring like the Redis keys.
+# TTLCache is not thread-safe (dequeue runs in worker threads), hence the lock.
+MEMORY_STATUS_MAXSIZE = 100_000
+_task_status = TTLCache(maxsize=MEMORY_STATUS_MAXSIZE, ttl=STATUS_TTL_SECONDS)
+_task_status_lock = threading.RLock()
 PROCESSING_KEY = "mineru:processing"
+# Size of the processing set, mirrored locally and re-read with SCARD at most
+# this often (other processes sharing Redis only show up on reconcile)
+PROCESSING_RECONCILE_SECONDS = 5.0
+_processing_count = 0
+_processing_count_synced_at: Optional[float] = None
+_processing_count_lock = threading.Lock()
+
+# Claim states returned by the scripts alongside each payload
+CLAIM_CLAIMED = 0  # Added to the processing set
+CLAIM_FINISHED = 1  # Already completed/failed (caller discards it)
+CLAIM_UNCLAIMED = 2  # No task ID readable by the script, left out of the set
+# Claim a popped task: appends payload and its claim state. JSON envelopes
+# from before msgpack are passed through unclaimed: cmsgpack would read each
+# of their bytes as a separate value and error after the pop.
+_CLAIM_LUA = """
+local function claim(payload, results)
+    local task = nil
+    if string.sub(payload, 1, 1) ~= '{' then
+        task = cmsgpack.unpack(payload)
+    end
+    local task_id = type(task) == 'table' and task.task_id
+    local state = 2
+    if task_id then
+        local status = redis.call('HGET', KEYS[2] .. task_id, 'status')
+        if status == 'completed' or status == 'failed' then
+            state = 1
+        else
+            redis.call('SADD', KEYS[3], task_id)
+            state = 0
+        end
+    end
+    results[#results + 1] = payload
+    results[#results + 1] = state
+end
+"""
+# Pop up to ARGV[1] tasks and claim them in one atomic step
+DEQUEUE_SCRIPT = _CLAIM_LUA + """
+local results = {}
+for i = 1, tonumber(ARGV[1]) do
+    local payload = redis.call('RPOP', KEYS[1])
+    if not payload then
+        break
+    end
+    claim(payload, results)
+end
+return results
+"""
+# Claim a task already popped by BRPOP (ARGV[1])
+CLAIM_SCRIPT = _CLAIM_LUA + """
+local results = {}
+claim(ARGV[1], results)
+return results
+"""
+_dequeue_script = None
+_claim_script = None
+
+
+def spool_file_path(spool_dir: str, suffix: str = ".pdf") -> str:
+    """Create an empty file in the upload spool directory and return its path."""
+    os.makedirs(spool_dir, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=spool_dir)
+    os.close(fd)
+    return path
+
+
+def discard_spooled_file(task_data: Dict[str, Any]):
+    """Remove a task's spooled upload if it will never be processed."""
+    file_path = task_data.get("file_path")
+    if file_path:
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove spooled file {file_path}: {e}")
+
+
+def _pack_task(task_data: Dict[str, Any]) -> bytes:
+    """Encode a task for the Redis queue."""
+    return msgpack.packb(task_data, use_bin_type=True)
+
+
+def _unpack_task(payload: bytes) -> Dict[str, Any]:
+    """Decode a task popped from the Redis queue."""
+    if payload[:1] == b"{":
+        # JSON envelope queued before the switch to msgpack
+        return _upgrade_legacy_task(orjson.loads(payload))
+    return msgpack.unpackb(payload, raw=False)
+
+
+def _upgrade_legacy_task(task_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Bring a JSON-era task up to the current shape.
+
+    The oldest envelopes carry the PDF inline as base64 "file_data" instead
+    of a "file_path"; those bytes are spooled to disk like new uploads.
+    """
+    file_data = task_data.pop("file_data", None)
+    encoded = task_data.pop("_file_data_encoded", False)
+    if file_data is not None and "file_path" not in task_data:
+        if encoded or isinstance(file_data, str):
+            file_data = base64.b64decode(file_data)
+        task_data["file_path"] = _spool_file_data(file_data, config.UPLOAD_SPOOL_DIR)
+    return task_data
+
+
+def _spool_file_data(file_data: bytes, spool_dir: Optional[str]) -> str:
+    """Write raw file bytes to the upload spool and return the new path."""
+    file_path = spool_file_path(spool_dir or tempfile.gettempdir())
+    with open(file_path, 'wb') as f:
+        f.write(file_data)
+    return file_path
+
+
+def _new_task_id() -> str:
+    """Random task ID: a UUID4 as 22 URL-safe base64 chars (vs 36 hex/dash)."""
+    return base64.urlsafe_b64encode(uuid.uuid4().bytes).rstrip(b"=").decode("ascii")
 
 
-def enqueue_task(task_data: Dict[str, Any]) -> str:
-    """Enqueue a task to Redis or in-memory queue."""
-    task_id = str(uuid.uuid4())
+def _prepare_task(
+    task_data: Dict[str, Any],
+    spool_dir: Optional[str],
+    created_at: str
+) -> str:
+    """Assign a task ID and pending status, spooling any raw file_data to disk."""
+    task_id = _new_task_id()
     task_data["task_id"] = task_id
     task_data["status"] = TaskStatus.PENDING.value
-    task_data["created_at"] = datetime.now(timezone.utc).isoformat()
+    task_data["created_at"] = created_at
+
+    file_data = task_data.pop("file_data", None)
+    if file_data is not None:
+        task_data["file_path"] = _spool_file_data(file_data, spool_dir)
+    return task_id
+
+
+def _initial_status(task_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Status record for a newly queued task (thin: not a copy of the task)."""
+    return {
+        "status": TaskStatus.PENDING.value,
+        "task_id": task_data["task_id"],
+        "created_at": task_data["created_at"]
+    }
+
+
+def enqueue_task(task_data: Dict[str, Any], spool_dir: Optional[str] = None) -> str:
+    """
+    Enqueue a task to Redis or in-memory queue.
+
+    Tasks reference their PDF by "file_path"; raw "file_data" bytes are
+    written to spool_dir first so the queue never carries file contents.
+    """
+    return enqueue_tasks([task_data], spool_dir)[0]
+
+
+def enqueue_tasks(
+    tasks: List[Dict[str, Any]],
+    spool_dir: Optional[str] = None
+) -> List[str]:
+    """
+    Enqueue several tasks at once (see enqueue_task).
+
+    With Redis, all queue pushes and status writes go out in one pipeline
+    (a single round trip however many tasks there are).
+    """
+    task_ids = _prepare_tasks(tasks, spool_dir)
 
     if _redis_client:
-        # Encode file_data (bytes) as base64 for JSON serialization
-        task_data_for_redis = task_data.copy()
-        if "file_data" in task_data_for_redis and isinstance(task_data_for_redis["file_data"], bytes):
-            task_data_for_redis["file_data"] = base64.b64encode(task_data_for_redis["file_data"]).decode('utf-8')
-            task_data_for_redis["_file_data_encoded"] = True
-        
-        _redis_client.lpush(QUEUE_KEY, json.dumps(task_data_for_redis))
-        _redis_client.setex(
-            f"{STATUS_KEY_PREFIX}{task_id}",
-            86400,  # 24 hours TTL
-            json.dumps({"status": TaskStatus.PENDING.value, "task": task_data_for_redis})
-        )
+        pipe = _redis_client.pipeline(transaction=False)
+        _queue_tasks(pipe, tasks)
+        pipe.execute()
     else:
-        global _processing_queue, _task_status
-        if _processing_queue is None:
-            _processing_queue = stdlib_queue.Queue()
-        _processing_queue.put(task_data)
-        _task_status[task_id] = {
-            "status": TaskStatus.PENDING.value, "task": task_data}
-
-    logger.info(
-        f"Enqueued task {task_id}: {task_data.get('filename', 'unknown')}")
-    return task_id
+        with _task_status_lock:
+            for task_id, task_data in zip(task_ids, tasks):
+                _task_status[task_id] = _initial_status(task_data)
+        with _queue_not_empty:
+            _processing_queue.extend(tasks)
+            _queue_not_empty.notify(len(tasks))
+
+    _log_enqueued(tasks)
+    return task_ids
+
+
+async def enqueue_tasks_async(
+    tasks: List[Dict[str, Any]],
+    spool_dir: Optional[str] = None
+) -> List[str]:
+    """
+    Enqueue several tasks from async code (see enqueue_tasks).
+
+    With Redis the pipeline is sent on the asyncio client, so the event loop
+    keeps serving other requests during the round trip.
+    """
+    if _async_redis_client is None:
+        # In-memory queue: nothing to wait on
+        return enqueue_tasks(tasks, spool_dir)
+
+    task_ids = _prepare_tasks(tasks, spool_dir)
+    async with _async_redis_client.pipeline(transaction=False) as pipe:
+        _queue_tasks(pipe, tasks)
+        await pipe.execute()
+
+    _log_enqueued(tasks)
+    return task_ids
+
+
+def _prepare_tasks(tasks: List[Dict[str, Any]], spool_dir: Optional[str]) -> List[str]:
+    """Prepare a batch of tasks for enqueueing; returns their task IDs."""
+    # One timestamp for the whole batch (tasks submitted together)
+    created_at = datetime.now(timezone.utc).isoformat()
+    return [_prepare_task(task_data, spool_dir, created_at) for task_data in tasks]
+
 
+def _queue_tasks(pipe, tasks: List[Dict[str, Any]]):
+    """Add queue pushes and initial status writes for prepared tasks to a pipeline."""
+    for task_data in tasks:
+        status_key = f"{STATUS_KEY_PREFIX}{task_data['task_id']}"
+        pipe.lpush(QUEUE_KEY, _pack_task(task_data))
+        pipe.hset(status_key, mapping=_initial_status(task_data))
+        pipe.expire(status_key, STATUS_TTL_SECONDS)
 
-def dequeue_task() -> Optional[Dict[str, Any]]:
-    """Dequeue a task from Redis or in-memory queue."""
+
+def _log_enqueued(tasks: List[Dict[str, Any]]):
+    """Log each enqueued task."""
+    for task_data in tasks:
+        logger.info(
+            f"Enqueued task {task_data['task_id']}: {task_data.get('filename', 'unknown')}")
+
+
+def _skip_finished(task_data: Dict[str, Any]):
+    """Drop a dequeued task that is already completed or failed."""
+    logger.warning(
+        f"Dequeued task {task_data.get('task_id')} that is already finished, skipping")
+    discard_spooled_file(task_data)
+
+
+def _claimed_tasks(results: List[Any]) -> List[Dict[str, Any]]:
+    """Decode claim script results (payload, state pairs), dropping finished tasks."""
+    tasks = []
+    claimed = 0
+    for i in range(0, len(results), 2):
+        task_data = _unpack_task(results[i])
+        state = results[i + 1]
+        if state == CLAIM_FINISHED:
+            _skip_finished(task_data)
+            continue
+        if state == CLAIM_CLAIMED:
+            claimed += 1
+        tasks.append(task_data)
+    # Only these were added to the processing set by the script
+    _adjust_processing_count(claimed)
+    return tasks
+
+
+def _is_finished_in_memory(task_data: Dict[str, Any]) -> bool:
+    """Check the in-memory status of a task dequeued from the fallback queue."""
+    with _task_status_lock:
+        existing_status = _task_status.get(task_data.get("task_id"), {})
+    return existing_status.get("status") in [
+        TaskStatus.COMPLETED.value, TaskStatus.FAILED.value]
+
+
+def dequeue_tasks(max_n: int) -> List[Dict[str, Any]]:
+    """
+    Dequeue up to max_n tasks from Redis or in-memory queue (non-blocking).
+
+    Tasks are marked as processing; tasks that are already completed or
+    failed are dropped (and their spooled file removed) instead of returned.
+    With Redis this is one round trip however many tasks are popped.
+    """
     if _redis_client:
         try:
-            result = _redis_client.brpop(QUEUE_KEY, timeout=1)
-            if result:
-                task_data = json.loads(result[1])
-                task_id = task_data.get("task_id")
-                
-                # Check if task is already completed/failed (safety check)
-                if task_id:
-                    existing_status = get_task_status(task_id)
-                    if existing_status:
-                        status = existing_status.get("status")
-                        if status in ["completed", "failed"]:
-                            logger.warning(
-                                f"Dequeued task {task_id} that is already {status}, skipping")
-                            return None
-                
-                # Decode file_data from base64 if it was encoded
-                if "_file_data_encoded" in task_data and task_data.get("_file_data_encoded"):
-                    if "file_data" in task_data and isinstance(task_data["file_data"], str):
-                        task_data["file_data"] = base64.b64decode(task_data["file_data"])
-                    task_data.pop("_file_data_encoded", None)
-                return task_data
-            return None
+            results = _dequeue_script(
+                keys=[QUEUE_KEY, STATUS_KEY_PREFIX, PROCESSING_KEY],
+                args=[max_n])
+            return _claimed_tasks(results)
         except Exception as e:
             logger.error(f"Error dequeuing task: {e}")
-            return None
-    else:
+            return []
+
+    tasks = []
+    while len(tasks) < max_n:
+        try:
+            task_data = _processing_queue.popleft()
+        except IndexError:
+            break
+        if _is_finished_in_memory(task_data):
+            _skip_finished(task_data)
+        else:
+            tasks.append(task_data)
+    return tasks
+
+
+def dequeue_task(block_seconds: float = 0) -> Optional[Dict[str, Any]]:
+    """
+    Dequeue one task (see dequeue_tasks).
+
+    If the queue is empty, waits up to block_seconds for a task to arrive
+    instead of returning at once, so blocking callers belong in a thread.
+    """
+    tasks = dequeue_tasks(1)
+    if tasks or block_seconds <= 0:
+        return tasks[0] if tasks else None
+
+    if _redis_client:
         try:
-            return _processing_queue.get_nowait()
-        except:
+            result = _redis_client.brpop(QUEUE_KEY, timeout=block_seconds)
+            if not result:
+                return None
+            tasks = _claimed_tasks(_claim_script(
+                keys=[QUEUE_KEY, STATUS_KEY_PREFIX, PROCESSING_KEY],
+                args=[result[1]]))
+            return tasks[0] if tasks else None
+        except Exception as e:
+            logger.error(f"Error dequeuing task: {e}")
             return None
 
+    with _queue_not_empty:
+        if not _processing_queue:
+            _queue_not_empty.wait(block_seconds)
+    try:
+        task_data = _processing_queue.popleft()
+    except IndexError:
+        return None
+    if _is_finished_in_memory(task_data):
+        _skip_finished(task_data)
+        return None
+    return task_data
+
 
 def update_task_status(
     task_id: str,
@@ -132,40 +446,96 @@ def update_task_status(
 
     if _redis_client:
         try:
-            existing = _redis_client.get(f"{STATUS_KEY_PREFIX}{task_id}")
-            if existing:
-                task_data = json.loads(existing)
-                task_data.update(status_data)
+            # Only the changed fields are written (no read-modify-write)
+            status_key = f"{STATUS_KEY_PREFIX}{task_id}"
+            result_key = f"{RESULT_KEY_PREFIX}{task_id}"
+            status_fields = {k: v for k, v in status_data.items() if k != "result"}
+            pipe = _redis_client.pipeline(transaction=False)
+            pipe.hset(status_key, mapping=dict(status_fields, task_id=task_id))
+            pipe.expire(status_key, STATUS_TTL_SECONDS)
+            if result:
+                pipe.set(result_key, orjson.dumps(result), ex=STATUS_TTL_SECONDS)
             else:
-                # If status doesn't exist, create it
-                task_data = status_data
-                task_data["task_id"] = task_id
-            
-            _redis_client.setex(
-                f"{STATUS_KEY_PREFIX}{task_id}",
-                86400,  # 24 hours TTL
-                json.dumps(task_data)
-            )
+                # Keep an earlier result alive as long as its status
+                pipe.expire(result_key, STATUS_TTL_SECONDS)
+            pipe.execute()
             logger.debug(f"Updated task {task_id} status to {status.value}")
         except Exception as e:
             logger.error(f"Failed to update task status in Redis: {e}")
             raise
     else:
-        if task_id in _task_status:
-            _task_status[task_id].update(status_data)
-        else:
+        with _task_status_lock:
+            existing = _task_status.get(task_id)
+            if existing is not None:
+                existing.update(status_data)
+                status_data = existing
+            # Re-insert to restart the TTL, like EXPIRE on the Redis key
             _task_status[task_id] = status_data
 
 
-def get_task_status(task_id: str) -> Optional[Dict[str, Any]]:
-    """Get task status from Redis or in-memory."""
-    if _redis_client:
-        data = _redis_client.get(f"{STATUS_KEY_PREFIX}{task_id}")
-        if data:
-            return json.loads(data)
+def _decode_status(raw: Dict[bytes, bytes], result: Optional[bytes]) -> Optional[Dict[str, Any]]:
+    """Build a status dict from a status hash and optional result blob."""
+    if not raw:
         return None
+    data = {field.decode(): value.decode() for field, value in raw.items()}
+    if result is not None:
+        data["result"] = orjson.loads(result)
+    return data
+
+
+def _memory_status(task_id: str, include_result: bool) -> Optional[Dict[str, Any]]:
+    """Status of a task in the in-memory fallback (caller holds the lock)."""
+    data = _task_status.get(task_id)
+    if data is None or include_result or "result" not in data:
+        return data
+    return {k: v for k, v in data.items() if k != "result"}
+
+
+def get_task_status(task_id: str, include_result: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Get task status from Redis or in-memory.
+
+    The result (if any) is only fetched and included when include_result is set.
+    """
+    if _redis_client:
+        pipe = _redis_client.pipeline(transaction=False)
+        pipe.hgetall(f"{STATUS_KEY_PREFIX}{task_id}")
+        if include_result:
+            pipe.get(f"{RESULT_KEY_PREFIX}{task_id}")
+        replies = pipe.execute()
+        return _decode_status(replies[0], replies[1] if include_result else None)
     else:
-        return _task_status.get(task_id)
+        with _task_status_lock:
+            return _memory_status(task_id, include_result)
+
+
+def get_task_statuses(
+    task_ids: List[str],
+    include_result: bool = False
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Get the status of several tasks (see get_task_status).
+
+    With Redis all reads go out in one pipeline (a single round trip).
+    Unknown task IDs map to None.
+    """
+    if _redis_client:
+        pipe = _redis_client.pipeline(transaction=False)
+        for task_id in task_ids:
+            pipe.hgetall(f"{STATUS_KEY_PREFIX}{task_id}")
+            if include_result:
+                pipe.get(f"{RESULT_KEY_PREFIX}{task_id}")
+        replies = pipe.execute()
+        step = 2 if include_result else 1
+        return {
+            task_id: _decode_status(
+                replies[i * step], replies[i * step + 1] if include_result else None)
+            for i, task_id in enumerate(task_ids)
+        }
+    else:
+        with _task_status_lock:
+            return {task_id: _memory_status(task_id, include_result)
+                    for task_id in task_ids}
 
 
 def get_queue_length() -> int:
@@ -173,28 +543,48 @@ def get_queue_length() -> int:
     if _redis_client:
         return _redis_client.llen(QUEUE_KEY)
     else:
-        return _processing_queue.qsize() if _processing_queue else 0
+        return len(_processing_queue)
+
+
+def _adjust_processing_count(delta: int):
+    """Track a change to the processing set in the local count."""
+    global _processing_count
+    if delta:
+        with _processing_count_lock:
+            _processing_count = max(0, _processing_count + delta)
 
 
 def get_processing_count() -> int:
     """Get number of currently processing tasks."""
     if _redis_client:
-        return _redis_client.scard(PROCESSING_KEY)
+        global _processing_count, _processing_count_synced_at
+        now = time.monotonic()
+        with _processing_count_lock:
+            if (_processing_count_synced_at is not None
+                    and now - _processing_count_synced_at < PROCESSING_RECONCILE_SECONDS):
+                return _processing_count
+        # Reconcile outside the lock so claims aren't held up by the round trip
+        count = _redis_client.scard(PROCESSING_KEY)
+        with _processing_count_lock:
+            _processing_count = count
+            _processing_count_synced_at = now
+            return _processing_count
     else:
-        return sum(1 for status in _task_status.values()
-                   if status.get("status") == TaskStatus.PROCESSING.value)
+        with _task_status_lock:
+            return sum(1 for status in _task_status.values()
+                       if status.get("status") == TaskStatus.PROCESSING.value)
 
 
 def mark_processing(task_id: str):
     """Mark task as processing."""
     if _redis_client:
-        _redis_client.sadd(PROCESSING_KEY, task_id)
+        _adjust_processing_count(_redis_client.sadd(PROCESSING_KEY, task_id))
 
 
 def unmark_processing(task_id: str):
     """Unmark task as processing."""
     if _redis_client:
-        _redis_client.srem(PROCESSING_KEY, task_id)
+        _adjust_processing_count(-_redis_client.srem(PROCESSING_KEY, task_id))
 
 
 def is_redis_configured() -> bool:
@@ -35,7 +35,7 @@ def init_worker():
 async def process_task(task_data: dict):
     """Process a single task (PDF parsing + indexing)."""
     task_id = task_data["task_id"]
-    file_data = task_data["file_data"]
+    file_path = task_data["file_path"]
     user_id = task_data["user_id"]
     document_id = task_data["document_id"]
     metadata = task_data.get("metadata")  # Can be dict or None
@@ -45,10 +45,9 @@ async def process_task(task_data: dict):
     temp_dir = None
 
     try:
-        # Mark as processing
+        # Mark as processing (dequeue_task already added it to the processing set)
         task_queue.update_task_status(
             task_id, task_queue.TaskStatus.PROCESSING)
-        task_queue.mark_processing(task_id)
 
         logger.info(
             f"Processing task {task_id}: {task_data.get('filename', 'unknown')}")
@@ -57,10 +56,11 @@ async def process_task(task_data: dict):
         temp_dir = Path(tempfile.mkdtemp(prefix=f"mineru_{document_id}_"))
         pdf_path = temp_dir / task_data.get("filename", f"{document_id}.pdf")
 
-        with open(pdf_path, 'wb') as f:
-            f.write(file_data)
+        # Move the spooled upload into place (no copy for same filesystem)
+        await asyncio.to_thread(shutil.move, file_path, pdf_path)
 
-        logger.info(f"Saved PDF to {pdf_path} ({len(file_data)} bytes)")
+        logger.info(
+            f"Saved PDF to {pdf_path} ({pdf_path.stat().st_size} bytes)")
 
         # Create output directory
         output_dir = temp_dir / "output"
@@ -68,8 +68,7 @@ async def process_task(task_data: dict):
 
         # Process with MinerU (GPU-accelerated)
         logger.info("Starting MinerU processing...")
-        content_list = await asyncio.to_thread(
-            mineru.parse_pdf,
+        content_list = await mineru.parse_pdf(
             pdf_path,
             output_dir,
             config.MINERU_BACKEND,
@@ -101,8 +100,7 @@ async def process_task(task_data: dict):
             # Just ensure filename is included
             indexing_metadata = dict(metadata) if metadata else {}
             indexing_metadata["filename"] = task_data.get("filename")
-            chunks_indexed = await asyncio.to_thread(
-                indexer.index_document,
+            chunks_indexed = await indexer.index_document(
                 user_id,
                 document_id,
                 content_list,
@@ -111,7 +109,9 @@ async def process_task(task_data: dict):
                 config.VOYAGE_MODEL,
                 config.QDRANT_URL,
                 config.QDRANT_API_KEY,
-                config.COLLECTION_NAME
+                config.COLLECTION_NAME,
+                config.QDRANT_PREFER_GRPC,
+                config.REDIS_URL if task_queue.is_redis_configured() else None
             )
             logger.info(
                 f"Indexed {chunks_indexed} chunks for document {document_id}")
@@ -205,27 +205,17 @@ async def worker_loop():
 
     while True:
         try:
-            # Dequeue task
-            task_data = task_queue.dequeue_task()
+            # Dequeue task, waiting in a thread while the queue is empty
+            # (finished tasks are already filtered out)
+            task_data = await asyncio.to_thread(
+                task_queue.dequeue_task, config.QUEUE_BLOCK_SECONDS)
 
             if task_data:
-                task_id = task_data.get("task_id")
-
-                # Check if task is already completed or failed (prevent reprocessing)
-                existing_status = task_queue.get_task_status(task_id)
-                if existing_status:
-                    status = existing_status.get("status")
-                    if status in ["completed", "failed"]:
-                        logger.warning(
-                            f"Skipping task {task_id}: already {status}")
-                        task_queue.unmark_processing(task_id)
-                        continue
-
                 # Acquire semaphore (limits concurrency)
                 async with _worker_semaphore:
                     await process_task(task_data)
             else:
-                # No tasks available, sleep briefly
+                # Wait timed out (or Redis errored), back off briefly
                 await asyncio.sleep(0.5)
 
         except Exception as e: